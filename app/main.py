@@ -3,6 +3,8 @@ import logging
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+from utils.metrics import metrics_asgi_app
+
 logging.basicConfig(
     filename="match_events.log",
     level=logging.INFO,
@@ -11,6 +13,10 @@ logging.basicConfig(
 
 app = FastAPI()
 
+metrics_app = metrics_asgi_app()
+if metrics_app is not None:
+    app.mount("/metrics", metrics_app)
+
 ALLOWED_IPS = {"127.0.0.1", "::1"}
 
 
@@ -0,0 +1,63 @@
+import os
+import time
+from typing import Any, Optional
+
+from celery_worker.routing import message_fixture_id, message_priority
+
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "20"))
+BATCH_MAX_WAIT_SECONDS = float(os.getenv("BATCH_MAX_WAIT_SECONDS", "0.5"))
+BATCH_TASK = "process_match_events_batch"
+
+
+class MessageBatcher:
+    """
+    Producer-side batcher: groups messages per fixture and sends each group
+    as one ``process_match_events_batch`` task once it holds ``max_size``
+    messages or its oldest message waited ``max_wait`` seconds. A goal or card
+    flushes its fixture right away so it never waits for the window.
+
+    Not thread-safe; meant for one producer loop. Call ``flush_due``
+    periodically (or ``flush`` at the end) so quiet fixtures are sent too.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_size: int = BATCH_MAX_SIZE,
+        max_wait: float = BATCH_MAX_WAIT_SECONDS,
+    ):
+        self.app = app
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._batches: dict[Any, list[dict]] = {}
+        self._started: dict[Any, float] = {}
+
+    def add(self, event: dict) -> None:
+        fixture_id = message_fixture_id(event)
+        batch = self._batches.setdefault(fixture_id, [])
+        if not batch:
+            self._started[fixture_id] = time.monotonic()
+        batch.append(event)
+        if len(batch) >= self.max_size or message_priority(event):
+            self.flush(fixture_id)
+        else:
+            self.flush_due()
+
+    def flush_due(self) -> None:
+        now = time.monotonic()
+        for fixture_id, started in list(self._started.items()):
+            if now - started >= self.max_wait:
+                self.flush(fixture_id)
+
+    def flush(self, fixture_id: Optional[Any] = None) -> None:
+        """Send the batch of one fixture, or every pending batch if omitted."""
+        fixture_ids = list(self._batches) if fixture_id is None else [fixture_id]
+        for key in fixture_ids:
+            batch = self._batches.pop(key, None)
+            self._started.pop(key, None)
+            if batch:
+                self.app.send_task(BATCH_TASK, args=[batch])
+
+    @property
+    def pending(self) -> int:
+        return sum(len(batch) for batch in self._batches.values())
@@ -0,0 +1,349 @@
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+import redis
+from dotenv import load_dotenv
+
+from utils.logger import setup_logger
+from utils.sqlite import SQLiteConnection
+
+load_dotenv()
+
+logger = setup_logger("match_event_service")
+
+DEDUP_BACKEND = os.getenv("DEDUP_BACKEND", "sqlite")
+DEDUP_REDIS_URL = os.getenv("DEDUP_REDIS_URL", "redis://localhost:6379/0")
+DEDUP_REDIS_PREFIX = os.getenv("DEDUP_REDIS_PREFIX", "dedup")
+DEDUP_SQLITE_PATH = os.getenv("DEDUP_SQLITE_PATH", "data/dedup.sqlite")
+# Entries of a fixture expire this long after its last event
+DEDUP_TTL_SECONDS = int(os.getenv("DEDUP_TTL_SECONDS", "86400"))
+DEDUP_LOCAL_SIZE = int(os.getenv("DEDUP_LOCAL_SIZE", "50000"))
+
+# Opta lastModified values ("2025-04-23T19:47:03.614") sort as strings, so an
+# older copy arriving late is treated as a repeat too.
+CLAIM_EVENT_SCRIPT = """
+local previous = redis.call('HGET', KEYS[1], ARGV[1])
+if previous and previous >= ARGV[2] then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# Keep the highest pending version of each event (pairs of id, version)
+NOTE_VERSIONS_SCRIPT = """
+for i = 1, #ARGV - 1, 2 do
+    local previous = redis.call('HGET', KEYS[1], ARGV[i])
+    if not previous or previous < ARGV[i + 1] then
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[#ARGV])
+return 1
+"""
+
+
+def event_version(e: dict) -> str:
+    return str(e.get("lastModified") or "")
+
+
+def event_key(feed_name: Any, event_id: Any) -> str:
+    """
+    Dedup key of an event. The copies of an event from different feeds are
+    processed on their own: each writes its row, and only some feeds render
+    images, so one copy must not claim the event for the others.
+    """
+    return f"{feed_name}:{event_id}" if feed_name else str(event_id)
+
+
+class DedupStore(ABC):
+    """
+    Remembers the latest ``lastModified`` processed per Opta event id.
+
+    Versions older than one this process already saw are rejected from a
+    small in-memory map without touching the shared store. Subclasses keep
+    the shared state.
+    """
+
+    def __init__(
+        self, ttl: int = DEDUP_TTL_SECONDS, local_size: int = DEDUP_LOCAL_SIZE
+    ):
+        self.ttl = ttl
+        self.local_size = local_size
+        self._seen: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim_event(self, fixture_id: Any, event_id: Any, last_modified: Any) -> bool:
+        """
+        :return: True if this version of the event has not been processed yet
+            (and marks it as processed), False for a repeat
+        """
+        key = (str(fixture_id), str(event_id))
+        version = str(last_modified or "")
+        with self._lock:
+            previous = self._seen.get(key)
+        # Only older versions are settled locally: another process may have
+        # released this one since, e.g. after its render or persist failed
+        if previous is not None and previous > version:
+            return False
+        claimed = self._claim_event(key[0], key[1], version)
+        if claimed or previous is None:
+            self._remember(key, version)
+        return claimed
+
+    def release_event(self, fixture_id: Any, event_id: Any) -> None:
+        """Forget an event so it is processed again, e.g. after a failure."""
+        key = (str(fixture_id), str(event_id))
+        with self._lock:
+            self._seen.pop(key, None)
+        self._release_event(*key)
+
+    @abstractmethod
+    def claim_render(self, fixture_id: Any, event_id: Any, kind: str) -> bool:
+        """
+        Claim the image of an event. Unlike events this ignores lastModified:
+        an image is rendered once however often the event is updated.
+        """
+
+    @abstractmethod
+    def release_render(self, fixture_id: Any, event_id: Any, kind: str) -> None:
+        pass
+
+    @abstractmethod
+    def note_versions(self, fixture_id: Any, versions: dict[Any, str]) -> None:
+        """
+        Record the versions of events that were just queued, so that copies
+        queued before them can be skipped as superseded.
+        """
+
+    @abstractmethod
+    def pending_versions(self, fixture_id: Any, event_ids: list) -> dict[str, str]:
+        """:return: Latest queued version of each event id that has one"""
+
+    @abstractmethod
+    def _claim_event(self, fixture_id: str, event_id: str, version: str) -> bool:
+        pass
+
+    @abstractmethod
+    def _release_event(self, fixture_id: str, event_id: str) -> None:
+        pass
+
+    def _remember(self, key: tuple[str, str], version: str) -> None:
+        with self._lock:
+            self._seen[key] = version
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.local_size:
+                self._seen.popitem(last=False)
+
+
+class RedisDedupStore(DedupStore):
+    """
+    One hash per fixture (``dedup:<fixture_id>``) of event id to lastModified,
+    expiring ``ttl`` seconds after the last claim. Render claims are SET NX keys.
+    """
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        url: str = DEDUP_REDIS_URL,
+        prefix: str = DEDUP_REDIS_PREFIX,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.client = client or redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._claim_script = self.client.register_script(CLAIM_EVENT_SCRIPT)
+        self._note_script = self.client.register_script(NOTE_VERSIONS_SCRIPT)
+
+    def _claim_event(self, fixture_id: str, event_id: str, version: str) -> bool:
+        return bool(
+            self._claim_script(
+                keys=[f"{self.prefix}:{fixture_id}"],
+                args=[event_id, version, self.ttl],
+            )
+        )
+
+    def _release_event(self, fixture_id: str, event_id: str) -> None:
+        self.client.hdel(f"{self.prefix}:{fixture_id}", event_id)
+
+    def note_versions(self, fixture_id: Any, versions: dict[Any, str]) -> None:
+        if not versions:
+            return
+        args = [str(v) for pair in versions.items() for v in pair]
+        self._note_script(
+            keys=[f"{self.prefix}:{fixture_id}:pending"], args=[*args, self.ttl]
+        )
+
+    def pending_versions(self, fixture_id: Any, event_ids: list) -> dict[str, str]:
+        if not event_ids:
+            return {}
+        ids = [str(i) for i in event_ids]
+        values = self.client.hmget(f"{self.prefix}:{fixture_id}:pending", ids)
+        return {i: v.decode() for i, v in zip(ids, values) if v is not None}
+
+    def claim_render(self, fixture_id: Any, event_id: Any, kind: str) -> bool:
+        key = f"{self.prefix}:{fixture_id}:render:{kind}:{event_id}"
+        return bool(self.client.set(key, 1, nx=True, ex=self.ttl))
+
+    def release_render(self, fixture_id: Any, event_id: Any, kind: str) -> None:
+        self.client.delete(f"{self.prefix}:{fixture_id}:render:{kind}:{event_id}")
+
+
+SQLITE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS fixtures ("
+    "fixture_id TEXT PRIMARY KEY, expires_at REAL);"
+    "CREATE TABLE IF NOT EXISTS events (fixture_id TEXT, event_id TEXT, "
+    "last_modified TEXT, PRIMARY KEY (fixture_id, event_id));"
+    "CREATE TABLE IF NOT EXISTS renders (fixture_id TEXT, event_id TEXT, "
+    "kind TEXT, PRIMARY KEY (fixture_id, event_id, kind));"
+    "CREATE TABLE IF NOT EXISTS pending (fixture_id TEXT, event_id TEXT, "
+    "last_modified TEXT, PRIMARY KEY (fixture_id, event_id));"
+)
+
+
+class SQLiteDedupStore(DedupStore):
+    """
+    Local fallback shared by the worker processes of one host. Each fixture
+    has an expiry that is pushed back whenever it gets a new event; the rows
+    of expired fixtures are purged.
+    """
+
+    PURGE_INTERVAL_SECONDS = 600
+
+    def __init__(self, path: str = DEDUP_SQLITE_PATH, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._db = SQLiteConnection(path, schema=SQLITE_SCHEMA)
+        self._last_purge = 0.0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def _transaction(self, fixture_id: str, work):
+        """Run ``work(conn)`` in a write transaction after touching the fixture."""
+        now = time.time()
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT expires_at FROM fixtures WHERE fixture_id = ?",
+                    (fixture_id,),
+                ).fetchone()
+                if row and row[0] <= now:
+                    self._delete_fixture(conn, fixture_id)
+                conn.execute(
+                    "INSERT OR REPLACE INTO fixtures VALUES (?, ?)",
+                    (fixture_id, now + self.ttl),
+                )
+                result = work(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._purge_expired(conn, now)
+        return result
+
+    def _claim_event(self, fixture_id: str, event_id: str, version: str) -> bool:
+        def work(conn):
+            row = conn.execute(
+                "SELECT last_modified FROM events WHERE fixture_id = ? AND event_id = ?",
+                (fixture_id, event_id),
+            ).fetchone()
+            if row is not None and row[0] >= version:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO events VALUES (?, ?, ?)",
+                (fixture_id, event_id, version),
+            )
+            return True
+
+        return self._transaction(fixture_id, work)
+
+    def _release_event(self, fixture_id: str, event_id: str) -> None:
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM events WHERE fixture_id = ? AND event_id = ?",
+                (fixture_id, event_id),
+            )
+
+    def note_versions(self, fixture_id: Any, versions: dict[Any, str]) -> None:
+        if not versions:
+            return
+        rows = [(str(fixture_id), str(i), str(v)) for i, v in versions.items()]
+
+        def work(conn):
+            conn.executemany(
+                "INSERT INTO pending VALUES (?, ?, ?) "
+                "ON CONFLICT (fixture_id, event_id) DO UPDATE SET "
+                "last_modified = excluded.last_modified "
+                "WHERE excluded.last_modified > pending.last_modified",
+                rows,
+            )
+
+        self._transaction(str(fixture_id), work)
+
+    def pending_versions(self, fixture_id: Any, event_ids: list) -> dict[str, str]:
+        if not event_ids:
+            return {}
+        ids = [str(i) for i in event_ids]
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT event_id, last_modified FROM pending WHERE fixture_id = ? "
+                f"AND event_id IN ({', '.join('?' * len(ids))})",  # nosec B608
+                (str(fixture_id), *ids),
+            ).fetchall()
+        return dict(rows)
+
+    def claim_render(self, fixture_id: Any, event_id: Any, kind: str) -> bool:
+        def work(conn):
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO renders VALUES (?, ?, ?)",
+                (str(fixture_id), str(event_id), kind),
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(str(fixture_id), work)
+
+    def release_render(self, fixture_id: Any, event_id: Any, kind: str) -> None:
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM renders WHERE fixture_id = ? AND event_id = ? AND kind = ?",
+                (str(fixture_id), str(event_id), kind),
+            )
+
+    @staticmethod
+    def _delete_fixture(conn: sqlite3.Connection, fixture_id: str) -> None:
+        conn.execute("DELETE FROM events WHERE fixture_id = ?", (fixture_id,))
+        conn.execute("DELETE FROM renders WHERE fixture_id = ?", (fixture_id,))
+        conn.execute("DELETE FROM pending WHERE fixture_id = ?", (fixture_id,))
+        conn.execute("DELETE FROM fixtures WHERE fixture_id = ?", (fixture_id,))
+
+    def _purge_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        if now - self._last_purge < self.PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        expired = conn.execute(
+            "SELECT fixture_id FROM fixtures WHERE expires_at <= ?", (now,)
+        ).fetchall()
+        if not expired:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        for (fixture_id,) in expired:
+            self._delete_fixture(conn, fixture_id)
+        conn.execute("COMMIT")
+        logger.info(f"🧹 Purged dedup entries of {len(expired)} fixtures")
+
+
+def dedup_store() -> DedupStore:
+    """Build the dedup store from the DEDUP_* settings."""
+    if DEDUP_BACKEND == "redis":
+        return RedisDedupStore()
+    return SQLiteDedupStore()
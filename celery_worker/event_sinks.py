@@ -0,0 +1,344 @@
+import csv
+import fcntl
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from google.sheet_spool import SheetSpool
+from google.sheet_writer import BufferedSheetWriter
+from utils.logger import setup_logger
+from utils.metrics import timed
+from utils.rate_limiter import TokenBucket
+from utils.sqlite import SQLiteConnection
+
+load_dotenv()
+
+logger = setup_logger("event_sinks")
+
+# Comma separated, written in this order with "sheets" always last
+EVENT_SINKS = os.getenv("EVENT_SINKS", "sheets")
+EVENT_SINK_DIR = os.getenv("EVENT_SINK_DIR", "data/events")
+PARQUET_ROWS_PER_FILE = int(os.getenv("PARQUET_ROWS_PER_FILE", "10000"))
+
+# Columns of the rows built by MatchEventService._process_single_event
+ROW_COLUMNS = (
+    "time_stamp",
+    "player",
+    "team",
+    "event_type",
+    "qualifiers",
+    "opta_id",
+    "fixture_id",
+    "feed_name",
+    "period",
+    "time_min",
+    "time_sec",
+    "x",
+    "y",
+)
+
+
+def padded(row: list) -> list:
+    """The row with exactly one value per column of ``ROW_COLUMNS``."""
+    return (list(row) + [None] * len(ROW_COLUMNS))[: len(ROW_COLUMNS)]
+
+
+def table_name(tab_name: Optional[str]) -> str:
+    """File and table name of a tab, e.g. "game events" -> "game_events"."""
+    return re.sub(r"\W+", "_", tab_name or "events").strip("_").lower()
+
+
+class EventSink(ABC):
+    """
+    Destination of the event rows. ``write`` takes rows in ``ROW_COLUMNS``
+    order; sinks that buffer write them out on ``flush`` and ``close``.
+    """
+
+    name = "sink"
+
+    @abstractmethod
+    def write(self, rows: list[list], tab_name: Optional[str] = None) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class SheetSink(EventSink):
+    """
+    Google Sheets, through the spool, the buffered writer or a direct
+    rate-limited request, whichever is configured.
+
+    :param row_writer: ``GoogleSheetService`` or ``SheetUpserter``
+    """
+
+    name = "sheets"
+
+    def __init__(
+        self,
+        row_writer,
+        rate_limiter: Optional[TokenBucket] = None,
+        spool: Optional[SheetSpool] = None,
+        buffer: Optional[BufferedSheetWriter] = None,
+    ):
+        self.row_writer = row_writer
+        self.rate_limiter = rate_limiter
+        self.spool = spool
+        self.buffer = buffer
+
+    def write(self, rows: list[list], tab_name: Optional[str] = None) -> None:
+        if self.spool is not None:
+            # A local commit; the drainer appends the rows to the sheet
+            self.spool.put(rows, tab_name=tab_name)
+        elif self.buffer is not None:
+            # Written with the rows of other tasks by the next flush
+            self.buffer.add_rows(rows)
+        else:
+            # One request for all rows; only the write waits for the Sheets quota
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            with timed("sheets_append"):
+                self.row_writer.append_rows(rows, tab_name=tab_name)
+            logger.info(f"✅ {len(rows)} rows written to {tab_name}")
+
+    def flush(self) -> None:
+        if self.buffer is not None:
+            self.buffer.flush()
+
+    def close(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+
+
+class CsvSink(EventSink):
+    """One CSV file per tab; appends are ``flock``-ed so processes can share it."""
+
+    name = "csv"
+
+    def __init__(self, directory: str = EVENT_SINK_DIR):
+        self.directory = directory
+
+    def write(self, rows: list[list], tab_name: Optional[str] = None) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{table_name(tab_name)}.csv")
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                writer = csv.writer(f)
+                if f.tell() == 0:
+                    writer.writerow(ROW_COLUMNS)
+                writer.writerows(rows)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class SQLiteSink(EventSink):
+    """One table per tab in a local SQLite file, every version of each event."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = os.path.join(EVENT_SINK_DIR, "events.sqlite")):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = SQLiteConnection(path, synchronous="NORMAL")
+        # Tables known to exist, per connection
+        self._tables: set = set()
+        self._tables_conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def _table(self, conn: sqlite3.Connection, tab_name: Optional[str]) -> str:
+        table = table_name(tab_name)
+        if self._tables_conn is not conn:
+            self._tables, self._tables_conn = set(), conn
+        if table not in self._tables:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "  # nosec B608
+                f"({', '.join(ROW_COLUMNS)}, written_at REAL)"
+            )
+            self._tables.add(table)
+        return table
+
+    def write(self, rows: list[list], tab_name: Optional[str] = None) -> None:
+        now = time.time()
+        placeholders = ", ".join("?" * (len(ROW_COLUMNS) + 1))
+        with self._lock:
+            conn = self.conn
+            table = self._table(conn, tab_name)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    f"INSERT INTO {table} VALUES ({placeholders})",  # nosec B608
+                    [[*padded(row), now] for row in rows],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+
+class ParquetSink(EventSink):
+    """
+    Parquet files per tab (``<dir>/<tab>/part-*.parquet``). Parquet files
+    cannot be appended to, so rows are buffered and each flush writes a new
+    part file; rows still buffered are lost if the process is killed.
+    Needs ``pyarrow``.
+    """
+
+    name = "parquet"
+
+    def __init__(
+        self,
+        directory: str = EVENT_SINK_DIR,
+        rows_per_file: int = PARQUET_ROWS_PER_FILE,
+    ):
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("The parquet event sink needs pyarrow") from e
+        self.directory = directory
+        self.rows_per_file = rows_per_file
+        self._rows: dict[Optional[str], list] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def write(self, rows: list[list], tab_name: Optional[str] = None) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Rows buffered by the parent are its own to write
+                self._rows, self._pid = {}, os.getpid()
+            buffered = self._rows.setdefault(tab_name, [])
+            buffered.extend(rows)
+            full = len(buffered) >= self.rows_per_file
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            pending, self._rows = self._rows, {}
+        for tab_name, rows in pending.items():
+            if not rows:
+                continue
+            directory = os.path.join(self.directory, table_name(tab_name))
+            os.makedirs(directory, exist_ok=True)
+            columns = zip(*map(padded, rows))
+            table = pa.table(
+                {column: list(values) for column, values in zip(ROW_COLUMNS, columns)}
+            )
+            path = os.path.join(
+                directory, f"part-{time.time_ns()}-{os.getpid()}.parquet"
+            )
+            pq.write_table(table, path)
+            logger.info(f"📦 {len(rows)} rows written to {path}")
+
+
+class FanOutSink(EventSink):
+    """
+    Writes to every sink in turn. ``write_events`` remembers per event which
+    sinks already have its row, so retrying after one sink failed (e.g. a
+    Sheets 429) does not write it twice to the others.
+    """
+
+    name = "fanout"
+
+    def __init__(self, sinks: list[EventSink]):
+        self.sinks = sinks
+
+    def write(self, rows: list[list], tab_name: Optional[str] = None) -> None:
+        self.write_events([{"row": row} for row in rows], tab_name)
+
+    def write_events(self, events: list[dict], tab_name: Optional[str] = None):
+        """
+        :param events: Dicts with the ``row`` to write; the names of the sinks
+            written are recorded under ``sinks``
+        :raises Exception: The first sink error, once every sink was tried
+        """
+        error = None
+        for sink in self.sinks:
+            pending = [e for e in events if sink.name not in e.get("sinks", [])]
+            if not pending:
+                continue
+            try:
+                sink.write([e["row"] for e in pending], tab_name=tab_name)
+            except Exception as e:
+                logger.error(
+                    f"❌ Error writing {len(pending)} rows to {sink.name}: {e}"
+                )
+                error = error or e
+                continue
+            for event in pending:
+                event.setdefault("sinks", []).append(sink.name)
+        if error is not None:
+            raise error
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.error(f"❌ Error closing the {sink.name} event sink: {e}")
+
+
+LOCAL_SINKS = {"csv": CsvSink, "sqlite": SQLiteSink, "parquet": ParquetSink}
+
+
+def event_sinks(
+    names: str = EVENT_SINKS, sheet_sink: Optional[SheetSink] = None
+) -> FanOutSink:
+    """
+    Build the sinks listed in EVENT_SINKS. Local sinks come first and Sheets
+    last, as a mirror that may lag or fail without holding up the others.
+
+    :param sheet_sink: Used for "sheets"; skipped if None
+    """
+    names = [n.strip().lower() for n in names.split(",") if n.strip()]
+    sinks: list[EventSink] = []
+    for name in names:
+        if name in LOCAL_SINKS:
+            sinks.append(LOCAL_SINKS[name]())
+        elif name != SheetSink.name:
+            raise ValueError(f"Unknown event sink: {name}")
+    if sheet_sink is not None and SheetSink.name in names:
+        sinks.append(sheet_sink)
+    return FanOutSink(sinks)
+
+
+if __name__ == "__main__":
+    # Usage: python -m celery_worker.event_sinks bench [sinks] [rows]
+    if len(sys.argv) < 2 or sys.argv[1] != "bench":
+        print(
+            "Usage: python -m celery_worker.event_sinks bench [csv,sqlite,parquet] [rows]"
+        )
+        sys.exit(1)
+    _names = sys.argv[2] if len(sys.argv) > 2 else "csv,sqlite"
+    _count = int(sys.argv[3]) if len(sys.argv) > 3 else 10000
+    _row = ["2025-04-23T19:46:58.201", "Player", "Team", "Pass", "", 0, "fixture"]
+    _row += ["matchEvent", 1, 12, 30, 50.1, 30.2]
+    for _sink in event_sinks(_names).sinks:
+        _started = time.perf_counter()
+        for _i in range(_count):
+            _sink.write([[*_row[:5], _i, *_row[6:]]], tab_name="bench")
+        _sink.close()
+        _elapsed = time.perf_counter() - _started
+        print(f"⏱️ {_sink.name}: {_count / _elapsed:,.0f} rows/s")
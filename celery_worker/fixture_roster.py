@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from directus.directus_service import DirectusService
+from utils.logger import setup_logger
+
+load_dotenv()
+
+logger = setup_logger("match_event_service")
+
+START_EVENT_TYPE_ID = 32
+END_EVENT_TYPE_ID = 30
+FIRST_HALF_PERIOD_ID = 1
+# End of normal time, extra time, penalties and the post-game period. If the
+# match carries on after one of them the squads are simply loaded again.
+MATCH_END_PERIOD_IDS = {2, 4, 5, 14}
+ROSTER_MAX_AGE_SECONDS = int(os.getenv("ROSTER_MAX_AGE_SECONDS", "21600"))
+
+
+def is_kickoff(e: dict) -> bool:
+    return (
+        e.get("typeId") == START_EVENT_TYPE_ID
+        and e.get("periodId") == FIRST_HALF_PERIOD_ID
+    )
+
+
+def is_match_end(e: dict) -> bool:
+    return (
+        e.get("typeId") == END_EVENT_TYPE_ID
+        and e.get("periodId") in MATCH_END_PERIOD_IDS
+    )
+
+
+class FixtureRoster:
+    """Teams (with goal_template) and squads of one fixture, keyed by opta_id."""
+
+    def __init__(self, fixture_id: str):
+        self.fixture_id = fixture_id
+        self.teams: dict[str, dict[str, Any]] = {}
+        self.players: dict[str, dict[str, Any]] = {}
+        self.loaded_at = time.monotonic()
+
+    def get_team(self, opta_id: Any) -> Optional[dict[str, Any]]:
+        return self.teams.get(str(opta_id))
+
+    def get_player(self, opta_id: Any) -> Optional[dict[str, Any]]:
+        return self.players.get(str(opta_id))
+
+
+class FixtureRosters:
+    """
+    Per-fixture rosters loaded when a fixture starts (or on its first event
+    after a worker restart) and evicted when the match ends.
+    """
+
+    def __init__(
+        self, directus: DirectusService, max_age: int = ROSTER_MAX_AGE_SECONDS
+    ):
+        self.directus = directus
+        self.max_age = max_age
+        self._rosters: dict[str, FixtureRoster] = {}
+        self._lock = threading.Lock()
+
+    def ensure_teams(self, fixture_id: str, team_ids: Iterable[Any]) -> FixtureRoster:
+        """
+        Return the fixture roster, loading any team (and its squad) that is
+        not in it yet: one request for the teams plus one per squad.
+
+        Directus is queried without holding the lock, so other fixtures are
+        not held up; two threads may load the same team once each.
+        """
+        with self._lock:
+            self._evict_stale()
+            roster = self._rosters.get(fixture_id)
+            if roster is None:
+                roster = self._rosters[fixture_id] = FixtureRoster(fixture_id)
+            missing = [i for i in team_ids if str(i) not in roster.teams]
+        if not missing:
+            return roster
+
+        teams = self.directus.get_teams_by_opta_ids(missing)
+        for opta_id, team in teams.items():
+            try:
+                squad = self.directus.get_players_by_team(team.get("id"))
+            except httpx.HTTPError as e:
+                # Players are then looked up one batch at a time
+                logger.warning(f"⚠️ Could not load squad of {team.get('name')}: {e}")
+                squad = {}
+            with self._lock:
+                roster.teams[str(opta_id)] = team
+                roster.players.update({str(k): v for k, v in squad.items()})
+            logger.info(
+                f"👥 Loaded {len(squad)} players of {team.get('name')} "
+                f"for fixture {fixture_id}"
+            )
+        return roster
+
+    def evict(self, fixture_id: str) -> None:
+        with self._lock:
+            if self._rosters.pop(fixture_id, None):
+                logger.info(f"🧹 Evicted roster of fixture {fixture_id}")
+
+    def _evict_stale(self) -> None:
+        now = time.monotonic()
+        for fixture_id, roster in list(self._rosters.items()):
+            if now - roster.loaded_at > self.max_age:
+                del self._rosters[fixture_id]
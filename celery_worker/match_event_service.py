@@ -1,24 +1,56 @@
+import asyncio
 import json
 import os
-import random
+import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime
-
+from typing import Optional
+
+import httpx
+
+from celery_worker.dedup_store import dedup_store, event_key, event_version
+from celery_worker.event_sinks import SheetSink, event_sinks
+from celery_worker.fixture_roster import FixtureRosters, is_kickoff, is_match_end
+from celery_worker.routing import (
+    CARD_EVENT_TYPE_ID,
+    GOAL_EVENT_TYPE_ID,
+    RED_CARD_QUALIFIER_ID,
+    YELLOW_CARD_QUALIFIER_ID,
+)
+from directus.async_directus_service import AsyncDirectusService
 from directus.directus_service import DirectusService
+from directus.records import to_plain
+from directus.redis_cache import RedisDirectusCache
+from directus.reference_data import ReferenceData
+from directus.snapshot import ReferenceSnapshot
 from google.sheet_service import GoogleSheetService
+from google.sheet_spool import SheetSpool, SpoolDrainer
+from google.sheet_upsert import SheetUpserter
+from google.sheet_writer import BufferedSheetWriter
 from image_processor.image_service import generate_cards_image, generate_goal_image
+from image_processor.render_slots import RENDER_STALE_SECONDS, RenderShed, render_slots
+from image_processor.utils import render_session
 from opta.opta_service import PerformFeedsService
 from utils.feature_flags import flags
 from utils.logger import setup_logger
+from utils.metrics import (
+    RENDERS_SHED_TOTAL,
+    count_event,
+    event_age,
+    observe_event_to_image,
+    timed,
+)
+from utils.rate_limiter import sheets_rate_limiter
 
 logger = setup_logger("match_event_service")
 
-YELLOW_CARD_QUALIFIER_ID = 31
-RED_CARD_QUALIFIER_ID = 33
-CARD_EVENT_TYPE_ID = 17
-GOAL_EVENT_TYPE_ID = 16
 FEED_NAME_SKIPPED_FOR_IMAGES = "matchEvent"
 FEED_NAME_LIVESCORE = "livescore"
+GAME_EVENTS_TAB = "game events"
+RENDERERS = {"goal": generate_goal_image, "card": generate_cards_image}
+# Never dropped by load shedding
+PROTECTED_RENDERS = {"goal"}
 
 
 def save_livescore_event(event, fixture_id):
@@ -48,15 +80,163 @@ def save_livescore_event(event, fixture_id):
     logger.info(f"📁 Appended LiveScore event to {filename}")
 
 
+def message_events(event) -> tuple:
+    """:return: Tuple (fixture_id, list of the Opta events) of a message"""
+    match_details = (
+        event.get("matchDetails") if isinstance(event, dict) else None
+    ) or {}
+    raw_events = match_details.get("event") or []
+    if isinstance(raw_events, dict):
+        raw_events = [raw_events]
+    return match_details.get("id"), raw_events
+
+
+def record_timing(payload: dict, stage: str, started: float) -> dict:
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    payload.setdefault("timings", {})[f"{stage}_ms"] = elapsed_ms
+    return payload
+
+
+def summarize(payload: dict) -> dict:
+    """
+    Compact task result: ids, status, stage timings and image paths instead
+    of the whole payload with its Directus records and sheet rows.
+    """
+    summary = {
+        "status": payload.get("status"),
+        "processed": payload.get("processed", 0),
+        "events": [
+            {
+                "opta_id": event_data.get("opta_id"),
+                "type_id": event_data.get("type_id"),
+                "fixture_id": event_data.get("fixture_id"),
+                "feed_name": event_data.get("feed_name"),
+                "persisted": bool(event_data.get("persisted")),
+                "images": [
+                    path
+                    for job in event_data.get("renders", [])
+                    for path in job.get("paths") or []
+                ],
+            }
+            for event_data in payload.get("details", [])
+        ],
+        "timings": payload.get("timings", {}),
+    }
+    if "message" in payload:
+        summary["message"] = payload["message"]
+    return summary
+
+
 class MatchEventService:
-    def __init__(self, sheet_id):
-        self.directus = DirectusService()
+    def __init__(self, sheet_id, reference_data: Optional[ReferenceData] = None):
+        """
+        Building the service does not connect anywhere: every client connects
+        on first use, in the process that uses it.
+
+        :param sheet_id: The ID of the Google Sheet rows are appended to
+        :param reference_data: Indexes already loaded, e.g. inherited from the
+            parent of a prefork child. Loaded from the snapshot or Directus if omitted
+        """
+        shared_cache = RedisDirectusCache() if flags.use_redis_directus_cache else None
+        snapshot = ReferenceSnapshot.load() if flags.use_directus_snapshot else None
+        self.directus = DirectusService(shared_cache=shared_cache, snapshot=snapshot)
+        if reference_data is not None:
+            reference_data.directus = self.directus
+            self.reference_data = reference_data
+        else:
+            self.reference_data = ReferenceData(self.directus)
+            if snapshot is not None:
+                self.reference_data.load_snapshot(snapshot)
+        self.rosters = FixtureRosters(self.directus)
+        self.dedup = dedup_store() if flags.use_event_dedup else None
+        self.render_slots = render_slots() if flags.limit_renders else None
         self.gsheet_service = GoogleSheetService(sheet_id)
+        self.sheet_rate_limiter = sheets_rate_limiter()
+        # What rows are written with: appended as they come, or one row per
+        # event. The upserter takes a token per request it makes, so whoever
+        # calls it must not take one too.
+        if flags.upsert_sheet_rows:
+            self.row_writer = SheetUpserter(
+                self.gsheet_service, rate_limiter=self.sheet_rate_limiter
+            )
+            write_rate_limiter = None
+        else:
+            self.row_writer = self.gsheet_service
+            write_rate_limiter = self.sheet_rate_limiter
+        self.sheet_writer = (
+            BufferedSheetWriter(self.row_writer, GAME_EVENTS_TAB, write_rate_limiter)
+            if flags.buffer_sheet_writes
+            else None
+        )
+        self.sheet_spool = SheetSpool() if flags.use_sheet_spool else None
+        # Started by the worker's main process only, see tasks.py
+        self.spool_drainer = (
+            SpoolDrainer(self.sheet_spool, self.row_writer, write_rate_limiter)
+            if self.sheet_spool is not None
+            else None
+        )
+        self.event_sink = event_sinks(
+            sheet_sink=(
+                SheetSink(
+                    self.row_writer,
+                    write_rate_limiter,
+                    spool=self.sheet_spool,
+                    buffer=self.sheet_writer,
+                )
+                if flags.save_to_gsheet
+                else None
+            )
+        )
         self.opta_service = PerformFeedsService()
         self.handler_map = {
             YELLOW_CARD_QUALIFIER_ID: self._handle_cards,
             RED_CARD_QUALIFIER_ID: self._handle_cards,
         }
+        self._async_local = threading.local()
+        self._async_states: list[tuple] = []
+        self._async_pid = os.getpid()
+
+    def _async_state(self) -> tuple:
+        """
+        Event loop and async Directus client of the calling thread. A loop
+        runs one ``run_until_complete`` at a time, so threads (e.g. of the
+        threads pool) each get their own, reused along with its connection
+        pool for every task of that thread.
+        """
+        if self._async_pid != os.getpid():
+            # Forked child: the parent's loops and clients are not ours
+            self._async_local, self._async_states = threading.local(), []
+            self._async_pid = os.getpid()
+        state = getattr(self._async_local, "state", None)
+        if state is None:
+            client = AsyncDirectusService(
+                cache=self.directus.cache,
+                shared_cache=self.directus.shared_cache,
+                snapshot=self.directus.snapshot,
+            )
+            state = self._async_local.state = (asyncio.new_event_loop(), client)
+            self._async_states.append(state)
+        return state
+
+    def _get_event_loop(self) -> asyncio.AbstractEventLoop:
+        return self._async_state()[0]
+
+    @property
+    def async_directus(self) -> AsyncDirectusService:
+        return self._async_state()[1]
+
+    def close(self) -> None:
+        self.reference_data.stop_background_refresh()
+        self.event_sink.close()
+        if self.spool_drainer is not None:
+            self.spool_drainer.stop()
+        self.directus.close()
+        if self._async_pid == os.getpid():
+            for loop, client in self._async_states:
+                if not loop.is_running():
+                    loop.run_until_complete(client.aclose())
+                    loop.close()
+        self._async_local, self._async_states = threading.local(), []
 
     @staticmethod
     def _handle_cards(qualifier_id, value, event_data) -> None:
@@ -72,22 +252,21 @@ class MatchEventService:
             logger.warning(f"⚠️ Unknown card qualifierId: {qualifier_id} value: {value}")
             return
         logger.info(f" -> Handling {color} card: {json.dumps(qualifier_id, indent=2)}")
-        try:
-            generate_cards_image(
-                {
+        event_data["renders"].append(
+            {
+                "kind": "card",
+                "params": {
                     "card_color": color,
                     "player_photo_url": player.get("photo"),
                     "player_name": player.get("name"),
-                }
-            )
-        except Exception as e:
-            logger.error(f"❌ Error generating card image: {e}")
-            return
+                },
+            }
+        )
 
-    def _handle_goal(self, event_data) -> None:
+    def _handle_goal(self, event_data, teams: dict) -> None:
         logger.info("⚽️ Processing goal event")
         player = event_data.get("player")
-        team = event_data.get("team")
+        team = event_data.get("team") or {}
         if not player:
             logger.error("❌ No player data found in event data for goal event")
             return
@@ -100,35 +279,41 @@ class MatchEventService:
             logger.error("❌ No score data found in event data for goal event")
         else:
             scoring_team_id = event_data.get("contestant_id")
-            scoring_team_name = event_data.get("team", {}).get("name")
+            scoring_team_name = team.get("name")
             for score in scores:
                 team_id = score.get("contestantId")
                 if team_id == scoring_team_id:
                     score["team_name"] = scoring_team_name
                 else:
-                    team = self.directus.get_team_by_opta_id(team_id)
-                    score["team_name"] = team.get("name") if team else "Unknown"
+                    opponent = teams.get(team_id)
+                    score["team_name"] = opponent.get("name") if opponent else "Unknown"
         opta_id = event_data.get("opta_id")
         logger.info(
             f"🟩 Current data for fixture ID {fixture_id} | event ID {opta_id}: "
             f"{json.dumps(scores, indent=2)}"
         )
-        try:
-            generate_goal_image(
-                {
+        event_data["renders"].append(
+            {
+                "kind": "goal",
+                "params": {
                     "player_name": player.get("name"),
                     "player_photo_url": player.get("photo"),
                     "team_goal_template_url": team.get("goal_template"),
-                }
-            )
-        except Exception as e:
-            logger.error(f"❌ Error generating goal image: {e}")
-            return
+                },
+            }
+        )
 
-    def process_event(self, event):
+    def _parse_event(self, event):
+        """
+        Validate the message and unpack it.
+
+        :return: Tuple (early_result, fixture_id, feed_name, raw_events). When
+            early_result is set there is nothing to process and it should be returned
+        """
         if not event or not event.get("matchDetails"):
             logger.warning("❌ No valid event data provided")
-            return {"status": "error", "message": "Invalid or empty event data"}
+            error = {"status": "error", "message": "Invalid or empty event data"}
+            return error, None, None, None
         if flags.debug_mode:
             logger.info(f"✅ Received event: {json.dumps(event, indent=2)}")
         match_details = event["matchDetails"]
@@ -138,28 +323,475 @@ class MatchEventService:
 
         if not raw_events:
             logger.warning("⚠️ No events found in matchDetails")
-            return {"status": "ok", "processed": 0, "details": []}
+            return {"status": "ok", "processed": 0, "details": []}, None, None, None
 
         if flags.save_livescore_events and feed_name == FEED_NAME_LIVESCORE:
             logger.info("📁 Saving LiveScore event data")
-            save_livescore_event(event, fixture_id)
+            with timed("livescore_save", feed_name):
+                save_livescore_event(event, fixture_id)
 
         # Ensure we have a list to iterate
         if isinstance(raw_events, dict):
             raw_events = [raw_events]
 
+        raw_events = self._coalesce_events(raw_events)
+        if self.dedup is not None:
+            raw_events = self._skip_processed_events(raw_events, fixture_id, feed_name)
+            if not raw_events:
+                return {"status": "ok", "processed": 0, "details": []}, None, None, None
+        return None, fixture_id, feed_name, raw_events
+
+    @staticmethod
+    def _coalesce_events(raw_events: list) -> list:
+        """Keep only the latest version of each event id, in seqId order."""
+        latest, others = {}, []
+        for e in raw_events:
+            if not isinstance(e, dict) or e.get("id") is None:
+                others.append(e)
+                continue
+            current = latest.get(e["id"])
+            if current is None or (event_version(e), e.get("seqId") or 0) >= (
+                event_version(current),
+                current.get("seqId") or 0,
+            ):
+                latest[e["id"]] = e
+        return others + sorted(latest.values(), key=lambda e: e.get("seqId") or 0)
+
+    def note_pending(self, event) -> None:
+        """
+        Record the event versions of a message that is being queued, so that
+        older copies still waiting in the queue are skipped as superseded.
+        """
+        if self.dedup is None:
+            return
+        fixture_id, raw_events = message_events(event)
+        feed_name = (event.get("matchDetails") or {}).get("feedName")
+        versions = {
+            event_key(feed_name, e["id"]): event_version(e)
+            for e in raw_events
+            if isinstance(e, dict) and e.get("id") is not None
+        }
+        self.dedup.note_versions(fixture_id, versions)
+
+    @staticmethod
+    def _drop_superseded(events: list) -> list:
+        """
+        Drop the events of a batch that a later message carries in a newer
+        version; messages left without events are dropped too.
+        """
+
+        def key(event, e):
+            feed_name = (event.get("matchDetails") or {}).get("feedName")
+            return message_events(event)[0], event_key(feed_name, e["id"])
+
+        latest = {}
+        for event in events:
+            for e in message_events(event)[1]:
+                if isinstance(e, dict) and e.get("id") is not None:
+                    latest[key(event, e)] = max(
+                        latest.get(key(event, e), ""), event_version(e)
+                    )
+
+        messages = []
+        for event in events:
+            fixture_id, raw_events = message_events(event)
+            kept = [
+                e
+                for e in raw_events
+                if not isinstance(e, dict)
+                or e.get("id") is None
+                or event_version(e) >= latest[key(event, e)]
+            ]
+            if raw_events and not kept:
+                continue
+            if len(kept) < len(raw_events):
+                event = {
+                    **event,
+                    "matchDetails": {**event["matchDetails"], "event": kept},
+                }
+            messages.append(event)
+        return messages
+
+    def _skip_processed_events(self, raw_events: list, fixture_id, feed_name) -> list:
+        """
+        Drop events whose id and lastModified were already processed for this
+        feed, or that a newer queued copy supersedes; the others are claimed
+        so concurrent copies skip them.
+        """
+        pending = self.dedup.pending_versions(
+            fixture_id,
+            [
+                event_key(feed_name, e["id"])
+                for e in raw_events
+                if isinstance(e, dict) and e.get("id")
+            ],
+        )
+        new_events = [
+            e
+            for e in raw_events
+            if not isinstance(e, dict)
+            or e.get("id") is None
+            or (
+                pending.get(event_key(feed_name, e["id"]), "") <= event_version(e)
+                and self.dedup.claim_event(
+                    fixture_id, event_key(feed_name, e["id"]), event_version(e)
+                )
+            )
+        ]
+        skipped = len(raw_events) - len(new_events)
+        if skipped:
+            logger.info(f"♻️ Skipped {skipped} repeated events of fixture {fixture_id}")
+        return new_events
+
+    def _release_events(self, raw_events: list, fixture_id, feed_name) -> None:
+        """Hand claimed events back after a failure so a retry processes them."""
+        if self.dedup is None:
+            return
+        for e in raw_events:
+            if isinstance(e, dict) and e.get("id") is not None:
+                self.dedup.release_event(fixture_id, event_key(feed_name, e["id"]))
+
+    def release_claims(self, payload: dict) -> None:
+        """
+        Hand back the claims of the events of a payload whose rows were not
+        persisted, once render or persist failed for good, so a resent copy
+        processes them again.
+        """
+        if self.dedup is None:
+            return
+        for event_data in payload.get("details", []):
+            if event_data.get("persisted") or event_data.get("opta_id") is None:
+                continue
+            self.dedup.release_event(
+                event_data.get("fixture_id"),
+                event_key(event_data.get("feed_name"), event_data["opta_id"]),
+            )
+
+    # The pipeline runs in three stages (enrich -> render -> persist). Each one
+    # takes and returns the same JSON serializable payload so the stages can
+    # also run as separate Celery tasks, see celery_worker.tasks.
+
+    def process_event(self, event):
+        return self._render_and_persist(self.enrich(event))
+
+    async def process_event_async(self, event):
+        return self._render_and_persist(await self.enrich_async(event))
+
+    def process_event_concurrently(self, event):
+        """Sync entry point for the async path, for use from Celery tasks."""
+        return self._render_and_persist(self.enrich_concurrently(event))
+
+    def _render_and_persist(self, payload: dict) -> dict:
+        try:
+            return summarize(self.persist(self.render(payload)))
+        except Exception:
+            self.release_claims(payload)
+            raise
+
+    def enrich(self, event) -> dict:
+        started = time.perf_counter()
+        early_result, fixture_id, feed_name, raw_events = self._parse_event(event)
+        if early_result:
+            return early_result
+        try:
+            with timed("directus_lookup", feed_name):
+                lookups = self._resolve_lookups(raw_events, fixture_id)
+            payload = self._process_events(raw_events, fixture_id, feed_name, lookups)
+            return record_timing(payload, "enrich", started)
+        except Exception:
+            self._release_events(raw_events, fixture_id, feed_name)
+            raise
+
+    async def enrich_async(self, event) -> dict:
+        started = time.perf_counter()
+        early_result, fixture_id, feed_name, raw_events = self._parse_event(event)
+        if early_result:
+            return early_result
+        try:
+            with timed("directus_lookup", feed_name):
+                lookups = await self._resolve_lookups_async(raw_events, fixture_id)
+            payload = self._process_events(raw_events, fixture_id, feed_name, lookups)
+            return record_timing(payload, "enrich", started)
+        except Exception:
+            self._release_events(raw_events, fixture_id, feed_name)
+            raise
+
+    def enrich_concurrently(self, event) -> dict:
+        return self._get_event_loop().run_until_complete(self.enrich_async(event))
+
+    def process_events_batch(self, events: list) -> dict:
+        return self._render_and_persist(self.enrich_batch(events))
+
+    def enrich_batch(self, events: list) -> dict:
+        """
+        Enrich several messages (usually of one fixture) into one payload,
+        resolving the lookups of each fixture and feed once. The feeds are
+        kept apart so the lookup timings stay labelled by feed; the second
+        feed of a fixture is mostly answered from the cache.
+        """
+        started = time.perf_counter()
+        parsed = []
+        for event in self._drop_superseded(events):
+            early_result, fixture_id, feed_name, raw_events = self._parse_event(event)
+            if not early_result:
+                parsed.append((fixture_id, feed_name, raw_events))
+        by_feed = {}
+        for fixture_id, feed_name, raw_events in parsed:
+            by_feed.setdefault((fixture_id, feed_name), []).extend(raw_events)
+
+        details = []
+        try:
+            for (fixture_id, feed_name), raw_events in by_feed.items():
+                with timed("directus_lookup", feed_name):
+                    if flags.use_async_enrichment:
+                        lookups = self._get_event_loop().run_until_complete(
+                            self._resolve_lookups_async(raw_events, fixture_id)
+                        )
+                    else:
+                        lookups = self._resolve_lookups(raw_events, fixture_id)
+                for message_fixture_id, message_feed_name, message_raw_events in parsed:
+                    if (
+                        message_fixture_id == fixture_id
+                        and message_feed_name == feed_name
+                    ):
+                        result = self._process_events(
+                            message_raw_events, fixture_id, feed_name, lookups
+                        )
+                        details.extend(result["details"])
+        except Exception:
+            for fixture_id, feed_name, raw_events in parsed:
+                self._release_events(raw_events, fixture_id, feed_name)
+            raise
+        payload = {"status": "ok", "processed": len(details), "details": details}
+        return record_timing(payload, "enrich", started)
+
+    def render(self, payload: dict) -> dict:
+        """
+        Render the images queued by enrich. Jobs that fail, or that never ran
+        because the browser did not start, keep an ``error`` so a retry only
+        renders those again.
+        """
+        if not self.failed_renders(payload):
+            return payload
+        started = time.perf_counter()
+        self._shed_stale(payload)
+        try:
+            with self._render_slot(payload):
+                # Cards may have gone stale while waiting for the slot
+                self._shed_stale(payload)
+                # One browser for every image of the payload
+                with render_session():
+                    for event_data in payload.get("details", []):
+                        self._render_event(event_data)
+        except RenderShed as e:
+            logger.warning(f"⚠️ Worker saturated: {e}")
+            for event_data in payload.get("details", []):
+                for job in self._sheddable_renders(event_data):
+                    self._shed_render(event_data, job, "saturated")
+        except Exception as e:
+            # Jobs catch their own errors, so the browser (or the slot) could
+            # not be set up; fail the images, not the rows
+            logger.error(f"❌ Error starting the image renders: {e}")
+            for job in self.failed_renders(payload):
+                job["error"] = str(e)
+        return record_timing(payload, "render", started)
+
+    @contextmanager
+    def _render_slot(self, payload: dict):
+        """One render slot for the payload; payloads with a goal are never shed."""
+        if self.render_slots is None or not self.failed_renders(payload):
+            yield
+            return
+        protected = any(
+            job["kind"] in PROTECTED_RENDERS for job in self.failed_renders(payload)
+        )
+        with self.render_slots.slot(protected=protected):
+            yield
+
+    def _shed_stale(self, payload: dict) -> None:
+        if self.render_slots is None:
+            return
+        for event_data in payload.get("details", []):
+            age = event_age(event_data.get("time_stamp"))
+            if age is None or age <= RENDER_STALE_SECONDS:
+                continue
+            for job in self._sheddable_renders(event_data):
+                self._shed_render(event_data, job, "stale")
+
+    @staticmethod
+    def _sheddable_renders(event_data: dict) -> list:
+        return [
+            job
+            for job in event_data.get("renders", [])
+            if not job.get("done") and job["kind"] not in PROTECTED_RENDERS
+        ]
+
+    @staticmethod
+    def _shed_render(event_data: dict, job: dict, reason: str) -> None:
+        logger.warning(
+            f"⏭️ Dropping {reason} {job['kind']} image of {event_data.get('opta_id')}"
+        )
+        # Done without paths: neither retried nor rendered by another copy
+        job["done"] = True
+        job["shed"] = reason
+        RENDERS_SHED_TOTAL.labels(kind=job["kind"], reason=reason).inc()
+
+    def _render_event(self, event_data: dict) -> None:
+        fixture_id = event_data.get("fixture_id")
+        opta_id = event_data.get("opta_id")
+        for job in event_data.get("renders", []):
+            if job.get("done"):
+                continue
+            if self.dedup and not self.dedup.claim_render(
+                fixture_id, opta_id, job["kind"]
+            ):
+                logger.info(f"♻️ {job['kind']} image of {opta_id} already rendered")
+                job["done"] = job["duplicate"] = True
+                continue
+            try:
+                with timed(
+                    f"render_{job['kind']}",
+                    event_data.get("feed_name"),
+                    event_data.get("type_id"),
+                ):
+                    job["paths"] = RENDERERS[job["kind"]](job["params"])
+            except Exception as e:
+                logger.error(f"❌ Error generating {job['kind']} image: {e}")
+                job["error"] = str(e)
+                if self.dedup:
+                    # Let the retry (or another copy of the event) claim it
+                    self.dedup.release_render(fixture_id, opta_id, job["kind"])
+                continue
+            job.pop("error", None)
+            job["done"] = True
+            observe_event_to_image(job["kind"], event_data.get("time_stamp"))
+
+    @staticmethod
+    def failed_renders(payload: dict) -> list:
+        return [
+            job
+            for event_data in payload.get("details", [])
+            for job in event_data.get("renders", [])
+            if not job.get("done")
+        ]
+
+    def persist(self, payload: dict) -> dict:
+        """
+        Write the rows built by enrich to every event sink, one request per
+        sink. Rows written are flagged (per sink) so a retry after e.g. a
+        Sheets 429 does not write them again.
+        """
+        if not self.event_sink.sinks:
+            return payload
+        pending = [
+            event_data
+            for event_data in payload.get("details", [])
+            if not event_data.get("persisted")
+        ]
+        if not pending:
+            return payload
+        started = time.perf_counter()
+        self.event_sink.write_events(pending, tab_name=GAME_EVENTS_TAB)
+        for event_data in pending:
+            event_data["persisted"] = True
+        return record_timing(payload, "persist", started)
+
+    def _process_events(self, raw_events, fixture_id, feed_name, lookups):
         results = [
-            self._process_single_event(e, fixture_id, feed_name)
+            self._process_single_event(e, fixture_id, feed_name, lookups)
             for e in raw_events
             if e
         ]
+        if any(isinstance(e, dict) and is_match_end(e) for e in raw_events):
+            self.rosters.evict(fixture_id)
 
+        details = [r for r in results if r]
         return {
             "status": "ok",
-            "processed": len([r for r in results if r]),
-            "details": [r for r in results if r],
+            "processed": len(details),
+            "details": details,
+        }
+
+    @staticmethod
+    def _collect_ids(raw_events: list) -> tuple[set, set, set, set]:
+        """Collect every player, team, event type and qualifier id in the events."""
+        player_ids, team_ids, type_ids, qualifier_ids = set(), set(), set(), set()
+        for e in raw_events:
+            if not isinstance(e, dict):
+                continue
+            player_ids.add(e.get("playerId"))
+            team_ids.add(e.get("contestantId"))
+            type_ids.add(e.get("typeId"))
+            for score in e.get("score") or []:
+                if isinstance(score, dict):
+                    team_ids.add(score.get("contestantId"))
+            for qualifier in e.get("qualifier") or []:
+                qualifier_ids.add(qualifier.get("qualifierId"))
+        for ids in (player_ids, team_ids, type_ids, qualifier_ids):
+            ids.discard(None)
+        return player_ids, team_ids, type_ids, qualifier_ids
+
+    def _resolve_lookups(self, raw_events: list, fixture_id) -> dict:
+        """
+        Resolve every id referenced by the events up front: teams and players
+        come from the fixture roster, anything else is fetched with a handful
+        of batch requests instead of one request per id.
+        """
+        player_ids, team_ids, type_ids, qualifier_ids = self._collect_ids(raw_events)
+        self._log_kickoff(raw_events, fixture_id)
+        self.reference_data.resolve_missing(type_ids, qualifier_ids)
+        roster = self.rosters.ensure_teams(fixture_id, team_ids)
+        lookups = self._roster_lookups(roster, player_ids, team_ids)
+        unknown_players = player_ids - lookups["players"].keys()
+        if unknown_players:
+            # e.g. a late signing that is not linked to the squad yet
+            try:
+                lookups["players"].update(
+                    self.directus.get_players_by_opta_ids(unknown_players)
+                )
+            except httpx.HTTPError as e:
+                logger.warning(f"⚠️ Directus player lookup failed: {e}")
+        return lookups
+
+    async def _resolve_lookups_async(self, raw_events: list, fixture_id) -> dict:
+        """
+        Same as _resolve_lookups, but every lookup runs concurrently so the
+        latency is that of the slowest request instead of their sum.
+        """
+        player_ids, team_ids, type_ids, qualifier_ids = self._collect_ids(raw_events)
+        self._log_kickoff(raw_events, fixture_id)
+        roster = await asyncio.to_thread(
+            self.rosters.ensure_teams, fixture_id, team_ids
+        )
+        lookups = self._roster_lookups(roster, player_ids, team_ids)
+        missing_types, missing_qualifiers = self.reference_data.missing_ids(
+            type_ids, qualifier_ids
+        )
+        players, event_types, qualifiers = await asyncio.gather(
+            self.async_directus.get_players_by_opta_ids(
+                player_ids - lookups["players"].keys()
+            ),
+            self.async_directus.get_event_types_by_opta_ids(missing_types),
+            self.async_directus.get_event_qualifiers_by_opta_ids(missing_qualifiers),
+        )
+        self.reference_data.add(event_types=event_types, qualifiers=qualifiers)
+        lookups["players"].update(players)
+        return lookups
+
+    @staticmethod
+    def _roster_lookups(roster, player_ids: set, team_ids: set) -> dict:
+        teams = {i: roster.get_team(i) for i in team_ids}
+        players = {i: roster.get_player(i) for i in player_ids}
+        return {
+            "players": {k: v for k, v in players.items() if v},
+            "teams": {k: v for k, v in teams.items() if v},
         }
 
+    @staticmethod
+    def _log_kickoff(raw_events: list, fixture_id) -> None:
+        if any(isinstance(e, dict) and is_kickoff(e) for e in raw_events):
+            logger.info(f"🏁 Kickoff for fixture {fixture_id}, loading squads")
+
     @staticmethod
     def _extract_event_metadata(e: dict) -> dict:
         return {
@@ -173,7 +805,7 @@ class MatchEventService:
             "score": e.get("score", {}),
         }
 
-    def _process_single_event(self, e, fixture_id, feed_name):
+    def _process_single_event(self, e, fixture_id, feed_name, lookups):
         if not isinstance(e, dict):
             logger.error(f"❌ Invalid event data format {e}")
             return None
@@ -185,26 +817,31 @@ class MatchEventService:
         contestant_id = e.get("contestantId")
         player_id = e.get("playerId")
 
-        event_type = self.directus.get_event_type_by_opta_id(type_id)
-        team = self.directus.get_team_by_opta_id(contestant_id)
-        player = self.directus.get_player_by_opta_id(player_id)
+        count_event(feed_name, type_id)
+        event_type = self.reference_data.get_event_type(type_id)
+        team = lookups["teams"].get(contestant_id)
+        player = lookups["players"].get(player_id)
 
         event_metadata = self._extract_event_metadata(e)
         event_data = {
-            "team": team,
-            "player": player,
+            "team": to_plain(team),
+            "player": to_plain(player),
             "opta_id": opta_id,
             "type_id": type_id,
             "contestant_id": contestant_id,
             "fixture_id": fixture_id,
             "feed_name": feed_name,
             **event_metadata,
+            "renders": [],
         }
 
         if type_id == GOAL_EVENT_TYPE_ID and feed_name != FEED_NAME_SKIPPED_FOR_IMAGES:
-            self._handle_goal(event_data)
+            self._handle_goal(event_data, lookups["teams"])
 
-        qualifiers_str = self._process_qualifiers(e.get("qualifier", []), event_data)
+        with timed("qualifiers", feed_name, type_id):
+            qualifiers_str = self._process_qualifiers(
+                e.get("qualifier", []), event_data
+            )
 
         row = [
             event_metadata["time_stamp"],
@@ -221,11 +858,7 @@ class MatchEventService:
             event_metadata["x"],
             event_metadata["y"],
         ]
-
-        if flags.save_to_gsheet:
-            self.gsheet_service.append_row(row, tab_name="game events")
-            print(f"✅ Row appended: {row}")
-        time.sleep(random.uniform(4.5, 7.5))  # To respect Google Sheets rate limits
+        event_data["row"] = row
 
         return event_data
 
@@ -248,7 +881,6 @@ class MatchEventService:
             ):
                 handler(qualifier_id, value, event_data)
 
-            qualifier_info = self.directus.get_event_qualifier_by_opta_id(qualifier_id)
-            name = qualifier_info.get("name") if qualifier_info else "Unknown"
+            name = self.reference_data.get_qualifier_name(qualifier_id)
             parts.append(f"{name} ({value})")
         return ", ".join(parts)
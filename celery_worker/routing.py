@@ -0,0 +1,163 @@
+import hashlib
+import os
+from typing import Any, Iterable
+
+from kombu import Queue
+
+# Shared by the producers (send_tasks.py) and the workers so both route and
+# declare the queues the same way. Kept free of service imports so producers
+# stay light.
+
+YELLOW_CARD_QUALIFIER_ID = 31
+RED_CARD_QUALIFIER_ID = 33
+CARD_QUALIFIER_IDS = {YELLOW_CARD_QUALIFIER_ID, RED_CARD_QUALIFIER_ID}
+CARD_EVENT_TYPE_ID = 17
+GOAL_EVENT_TYPE_ID = 16
+
+DEFAULT_QUEUE = "celery"
+HIGH_PRIORITY_QUEUE = os.getenv("HIGH_PRIORITY_QUEUE", "high_priority")
+ENRICH_QUEUE = os.getenv("ENRICH_QUEUE", "enrich")
+RENDER_QUEUE = os.getenv("RENDER_QUEUE", "render")
+PERSIST_QUEUE = os.getenv("PERSIST_QUEUE", "persist")
+
+# Messages of one fixture always go to the same shard queue so a worker with
+# concurrency 1 on it processes them in order. 0 disables sharding.
+FIXTURE_SHARDS = int(os.getenv("FIXTURE_SHARDS", "0"))
+FIXTURE_SHARD_QUEUE = os.getenv("FIXTURE_SHARD_QUEUE", "fixtures")
+
+# Tasks that take a raw message or a list of messages of one fixture
+MESSAGE_TASKS = {
+    "process_match_event",
+    "process_match_events_batch",
+    "enrich_match_event",
+}
+
+MAX_PRIORITY = 9
+GOAL_PRIORITY = 9
+CARD_PRIORITY = 7
+
+STAGE_QUEUES = {
+    "enrich_match_event": ENRICH_QUEUE,
+    "render_match_event": RENDER_QUEUE,
+    "persist_match_event": PERSIST_QUEUE,
+}
+
+
+def event_priority(e: Any) -> int:
+    """Priority of a single Opta event: goals first, then cards, then the rest."""
+    if not isinstance(e, dict):
+        return 0
+    type_id = e.get("typeId")
+    if type_id == GOAL_EVENT_TYPE_ID:
+        return GOAL_PRIORITY
+    if type_id == CARD_EVENT_TYPE_ID and any(
+        q.get("qualifierId") in CARD_QUALIFIER_IDS for q in e.get("qualifier") or []
+    ):
+        return CARD_PRIORITY
+    return 0
+
+
+def message_priority(event: Any) -> int:
+    """Highest event priority of a ``{"matchDetails": ...}`` message."""
+    if not isinstance(event, dict):
+        return 0
+    raw_events = (event.get("matchDetails") or {}).get("event") or []
+    if isinstance(raw_events, dict):
+        raw_events = [raw_events]
+    return max((event_priority(e) for e in raw_events), default=0)
+
+
+def payload_priority(payload: Any) -> int:
+    """Highest priority of an enriched payload passed between pipeline stages."""
+    if not isinstance(payload, dict):
+        return 0
+    priorities = [0]
+    for event_data in payload.get("details") or []:
+        kinds = {job.get("kind") for job in event_data.get("renders") or []}
+        if "goal" in kinds:
+            priorities.append(GOAL_PRIORITY)
+        elif "card" in kinds:
+            priorities.append(CARD_PRIORITY)
+    return max(priorities)
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Jump consistent hash (Lamping & Veach): only 1/n of the keys move when
+    the number of buckets grows to n.
+    """
+    bucket, j = -1, 0
+    while j < buckets:
+        bucket = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+
+def fixture_shard(fixture_id: Any, shards: int = FIXTURE_SHARDS) -> int:
+    # hash() is salted per process, producers and workers must agree
+    digest = hashlib.blake2b(str(fixture_id).encode(), digest_size=8).digest()
+    return jump_hash(int.from_bytes(digest, "big"), shards)
+
+
+def shard_queue(shard: int) -> str:
+    return f"{FIXTURE_SHARD_QUEUE}.{shard}"
+
+
+def as_messages(arg: Any) -> list:
+    """A task argument holding one message or a batch of them, as a list."""
+    return arg if isinstance(arg, list) else [arg]
+
+
+def message_fixture_id(event: Any) -> Any:
+    if isinstance(event, list):
+        return message_fixture_id(event[0]) if event else None
+    if not isinstance(event, dict):
+        return None
+    return (event.get("matchDetails") or {}).get("id")
+
+
+def task_priority(name: str, args: Iterable[Any]) -> int:
+    args = list(args or [])
+    if not args:
+        return 0
+    if name in MESSAGE_TASKS:
+        return max((message_priority(e) for e in as_messages(args[0])), default=0)
+    return payload_priority(args[0])
+
+
+def route_match_event(name, args, kwargs, options, task=None, **kw):
+    """
+    Celery router: goals and cards go to the high priority queue (whatever
+    the stage) with a RabbitMQ message priority. With FIXTURE_SHARDS the
+    entry and enrich tasks of other events go to the shard of their fixture,
+    everything else to the queue of its stage.
+    """
+    if name not in MESSAGE_TASKS and name not in STAGE_QUEUES:
+        return None
+    priority = task_priority(name, args)
+    if priority:
+        return {"queue": HIGH_PRIORITY_QUEUE, "priority": priority}
+    if FIXTURE_SHARDS and name in MESSAGE_TASKS and args:
+        fixture_id = message_fixture_id(args[0])
+        if fixture_id:
+            return {"queue": shard_queue(fixture_shard(fixture_id, FIXTURE_SHARDS))}
+    return {"queue": STAGE_QUEUES.get(name, DEFAULT_QUEUE)}
+
+
+def configure_routing(app) -> None:
+    """Declare the queues and install the router on a Celery app."""
+    priority_args = {"x-max-priority": MAX_PRIORITY}
+    app.conf.task_queues = [
+        # Declared before priorities existed, redeclaring it with other
+        # arguments would be refused by RabbitMQ
+        Queue(DEFAULT_QUEUE),
+        Queue(HIGH_PRIORITY_QUEUE, queue_arguments=priority_args),
+        *(Queue(q, queue_arguments=priority_args) for q in STAGE_QUEUES.values()),
+        *(Queue(shard_queue(shard)) for shard in range(FIXTURE_SHARDS)),
+    ]
+    app.conf.task_default_queue = DEFAULT_QUEUE
+    app.conf.task_routes = (route_match_event,)
+    # Without this a prefetched batch of passes would still be served before
+    # a goal that arrives later
+    app.conf.worker_prefetch_multiplier = 1
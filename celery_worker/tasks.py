@@ -1,10 +1,23 @@
 import os
+from typing import Optional
 
-from celery import Celery
+import requests
+from celery import Celery, chain
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 from dotenv import load_dotenv
+from gspread.exceptions import APIError
+from httpx import HTTPError
 
-from celery_worker.match_event_service import MatchEventService
+from celery_worker.match_event_service import MatchEventService, summarize
+from celery_worker.routing import configure_routing
+from utils.feature_flags import flags
 from utils.logger import setup_logger
+from utils.metrics import mark_process_dead, start_metrics_server
 
 logger = setup_logger("match_event_service")
 
@@ -19,11 +32,164 @@ if not broker_url:
 app = Celery(
     "process_match_event",
     broker=broker_url,  # RabbitMQ broker
+    backend=os.getenv("RESULT_BACKEND"),
 )
+# Results are compact summaries; turn them off entirely or keep them briefly
+app.conf.task_ignore_result = flags.ignore_task_results
+app.conf.result_expires = int(os.getenv("RESULT_EXPIRES_SECONDS", "3600"))
+
+# Each stage has its own queue so render and persist workers can be scaled
+# (and given their own pool settings) independently, see docker-compose.yml.
+# Goals and cards skip them for the high priority queue, see routing.py.
+configure_routing(app)
+
+RENDER_MAX_RETRIES = int(os.getenv("RENDER_MAX_RETRIES", "3"))
+PERSIST_MAX_RETRIES = int(os.getenv("PERSIST_MAX_RETRIES", "8"))
+PERSIST_RETRY_ERRORS = (APIError, requests.RequestException)
+
+_match_service: Optional[MatchEventService] = None
+_match_service_pid: Optional[int] = None
+
+
+def get_match_service() -> MatchEventService:
+    """
+    The service of the current process, built on first use and never at
+    import time, so ``celery inspect`` and the prefork parent stay offline.
+    A forked child builds its own clients but keeps the reference data
+    indexes loaded by the parent.
+    """
+    global _match_service, _match_service_pid
+    if _match_service is None or _match_service_pid != os.getpid():
+        inherited = _match_service.reference_data if _match_service else None
+        _match_service = MatchEventService(sheet_id, reference_data=inherited)
+        _match_service_pid = os.getpid()
+    return _match_service
+
+
+@worker_init.connect
+def load_reference_data(**kwargs):
+    # Loaded once in the parent so prefork children inherit the indexes. When a
+    # snapshot was loaded this does not touch Directus at all.
+    service = get_match_service()
+    service.reference_data.ensure_loaded()
+    service.reference_data.start_background_refresh()
+    if service.spool_drainer is not None:
+        # One drainer per worker, children only write to the spool
+        service.spool_drainer.start()
+    if flags.enable_metrics:
+        # One endpoint for the whole worker; with prefork children set
+        # PROMETHEUS_MULTIPROC_DIR so their samples are merged in
+        start_metrics_server()
+
+
+@worker_process_init.connect
+def init_match_service(**kwargs):
+    # Build the child's own clients now; threads do not survive fork, so the
+    # refresher is started again too
+    get_match_service().reference_data.start_background_refresh()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_clients(**kwargs):
+    # Also flushes buffered sheet rows; worker_shutdown covers the solo and
+    # threads pools, which have no child processes
+    if _match_service is not None and _match_service_pid == os.getpid():
+        _match_service.close()
+    mark_process_dead(os.getpid())
 
-match_service = MatchEventService(sheet_id)
+
+def retry_countdown(retries: int) -> int:
+    return min(5 * 2**retries, 300)
 
 
 @app.task(name="process_match_event")
 def process_match_event(event):
-    return match_service.process_event(event)
+    service = get_match_service()
+    if flags.use_staged_pipeline:
+        # Older copies of these events still queued for enrich become no-ops
+        service.note_pending(event)
+        pipeline = chain(
+            enrich_match_event.s(event),
+            render_match_event.s(),
+            persist_match_event.s(),
+        ).apply_async()
+        return {"status": "queued", "pipeline_id": pipeline.id}
+    if flags.use_async_enrichment:
+        return service.process_event_concurrently(event)
+    return service.process_event(event)
+
+
+@app.task(name="process_match_events_batch")
+def process_match_events_batch(events):
+    """Several messages (of one fixture) with one enrich, render and persist pass."""
+    service = get_match_service()
+    if flags.use_staged_pipeline:
+        for event in events:
+            service.note_pending(event)
+        pipeline = chain(
+            enrich_match_event.s(events),
+            render_match_event.s(),
+            persist_match_event.s(),
+        ).apply_async()
+        return {"status": "queued", "pipeline_id": pipeline.id}
+    return service.process_events_batch(events)
+
+
+# Intermediate stages hand their payload to the next task in the message, it
+# never needs to be stored in the result backend
+@app.task(
+    name="enrich_match_event",
+    ignore_result=True,
+    autoretry_for=(HTTPError,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def enrich_match_event(event):
+    service = get_match_service()
+    if isinstance(event, list):
+        return service.enrich_batch(event)
+    if flags.use_async_enrichment:
+        return service.enrich_concurrently(event)
+    return service.enrich(event)
+
+
+@app.task(
+    name="render_match_event",
+    bind=True,
+    ignore_result=True,
+    max_retries=RENDER_MAX_RETRIES,
+)
+def render_match_event(self, payload):
+    service = get_match_service()
+    try:
+        payload = service.render(payload)
+    except Exception:
+        # The chain stops here, let a resent copy of the events through
+        service.release_claims(payload)
+        raise
+    if service.failed_renders(payload) and self.request.retries < self.max_retries:
+        # Retry with the updated payload so finished images are not rendered again
+        raise self.retry(
+            args=[payload], countdown=retry_countdown(self.request.retries)
+        )
+    # Give up on the images rather than the rows
+    return payload
+
+
+@app.task(name="persist_match_event", bind=True, max_retries=PERSIST_MAX_RETRIES)
+def persist_match_event(self, payload):
+    service = get_match_service()
+    try:
+        return summarize(service.persist(payload))
+    except PERSIST_RETRY_ERRORS as e:
+        if self.request.retries >= self.max_retries:
+            service.release_claims(payload)
+            raise
+        logger.warning(f"⚠️ Persisting rows failed, retrying: {e}")
+        raise self.retry(
+            args=[payload], exc=e, countdown=retry_countdown(self.request.retries)
+        )
+    except Exception:
+        service.release_claims(payload)
+        raise
@@ -0,0 +1,270 @@
+import asyncio
+import os
+from typing import Any, Iterable, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from directus.directus_service import (
+    BATCH_CHUNK_SIZE,
+    HTTP_MAX_RETRIES,
+    RETRY_STATUS_CODES,
+    CachedLookupsMixin,
+    DirectusQueryParams,
+    TTLCache,
+    batch_params,
+    build_query,
+    cache_ttl,
+    client_options,
+    match_batch,
+    retry_delay,
+)
+from directus.records import record_fields
+from directus.redis_cache import RedisDirectusCache
+from directus.snapshot import ReferenceSnapshot
+from utils.logger import setup_logger
+
+load_dotenv()
+
+logger = setup_logger("directus_service")
+
+
+class AsyncDirectusService(CachedLookupsMixin):
+    """
+    asyncio counterpart of DirectusService built on httpx.AsyncClient.
+
+    Pass the sync service's caches and snapshot to share lookups between
+    both paths.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        token: Optional[str] = None,
+        cache: Optional[TTLCache] = None,
+        shared_cache: Optional[RedisDirectusCache] = None,
+        snapshot: Optional[ReferenceSnapshot] = None,
+    ):
+        if not token:
+            token = os.getenv("DIRECTUS_TOKEN")
+        if not base_url:
+            base_url = os.getenv("DIRECTUS_BASE_URL")
+        self.base_url = base_url.rstrip("/")
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        }
+        self._init_lookup_cache(cache, shared_cache, snapshot, asyncio.Event)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client_pid: Optional[int] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Pooled client bound to the running event loop; recreated when used
+        from another loop or after a fork.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._client is None
+            or self._client_loop is not loop
+            or self._client_pid != os.getpid()
+        ):
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, headers=self.headers, **client_options()
+            )
+            self._client_loop = loop
+            self._client_pid = os.getpid()
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._client_pid == os.getpid():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+        self._client_pid = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _request(self, path: str, query: dict[str, Any]) -> httpx.Response:
+        """GET with retry and exponential backoff on transport errors, 5xx and 429."""
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self.client.get(path, params=query)
+            except httpx.TransportError as e:
+                if attempt >= HTTP_MAX_RETRIES:
+                    raise
+                logger.warning(f"⚠️ Directus request to {path} failed: {e}")
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= HTTP_MAX_RETRIES
+                ):
+                    response.raise_for_status()
+                    return response
+            delay = retry_delay(attempt, response)
+            attempt += 1
+            logger.warning(
+                f"🔁 Retrying Directus request to {path} in {delay:.2f}s "
+                f"(attempt {attempt}/{HTTP_MAX_RETRIES})"
+            )
+            await asyncio.sleep(delay)
+
+    async def get_items(self, params: DirectusQueryParams) -> list:
+        response = await self._request(f"/items/{params.entity}", build_query(params))
+        return response.json()["data"]
+
+    async def _get_first_cached(
+        self, cache_key: str, opta_id: Any, params: DirectusQueryParams
+    ) -> Optional[dict[str, Any]]:
+        ttl = cache_ttl(params.entity)
+        cached, missing = self._cache_get_many(cache_key, [opta_id], ttl=ttl)
+        if not missing:
+            return cached.get(opta_id)
+        own, waiting = self.in_flight.claim(cache_key, missing)
+        if waiting:
+            await self.in_flight.wait_async(waiting)
+            cached, missing = self._cache_get_many(cache_key, [opta_id], ttl=ttl)
+            if not missing:
+                return cached.get(opta_id)
+        try:
+            results = await self.get_items(params)
+            value = self.materialize(params.entity, results[0]) if results else None
+            found = {opta_id: value} if value is not None else {}
+            self._cache_results(cache_key, [opta_id], found, ttl=ttl)
+        finally:
+            self.in_flight.release(cache_key, own)
+        return value
+
+    async def _fetch_many(
+        self,
+        cache_key: str,
+        entity: str,
+        opta_ids: list[Any],
+        integration: bool,
+        ttl: Optional[float],
+    ) -> dict[Any, Any]:
+        # Chunks are independent, so they are fetched concurrently as well
+        chunks = [
+            opta_ids[start : start + BATCH_CHUNK_SIZE]
+            for start in range(0, len(opta_ids), BATCH_CHUNK_SIZE)
+        ]
+        responses = await asyncio.gather(
+            *(self.get_items(batch_params(entity, c, integration)) for c in chunks)
+        )
+        results = {}
+        for chunk, items in zip(chunks, responses):
+            found = {
+                opta_id: self.materialize(entity, item)
+                for opta_id, item in match_batch(chunk, items, integration).items()
+            }
+            self._cache_results(cache_key, chunk, found, ttl=ttl)
+            results.update(found)
+        return results
+
+    async def _get_many_cached(
+        self,
+        cache_key: str,
+        entity: str,
+        opta_ids: Iterable[Any],
+        integration: bool = False,
+    ) -> dict[Any, dict[str, Any]]:
+        ttl = cache_ttl(entity)
+        results, missing = self._cache_get_many(cache_key, opta_ids, ttl=ttl)
+        own, waiting = self.in_flight.claim(cache_key, missing)
+        try:
+            results.update(
+                await self._fetch_many(cache_key, entity, own, integration, ttl)
+            )
+        finally:
+            self.in_flight.release(cache_key, own)
+        if waiting:
+            await self.in_flight.wait_async(waiting)
+            others = [i for i in missing if i not in own]
+            cached, leftover = self._cache_get_many(cache_key, others, ttl=ttl)
+            results.update(cached)
+            results.update(
+                await self._fetch_many(cache_key, entity, leftover, integration, ttl)
+            )
+        return results
+
+    async def get_event_qualifier_by_opta_id(
+        self, opta_id: int
+    ) -> Optional[dict[str, Any]]:
+        params = DirectusQueryParams(
+            entity="opta_event_qualifiers",
+            filter={"opta_id": {"_eq": opta_id}},
+            limit=1,
+            fields=record_fields("opta_event_qualifiers"),
+        )
+        return await self._get_first_cached("opta_event_qualifiers", opta_id, params)
+
+    async def get_integration_by_opta_id(
+        self, opta_id: int
+    ) -> Optional[dict[str, Any]]:
+        params = DirectusQueryParams(
+            entity="integrations",
+            filter={"opta_id": {"_eq": opta_id}},
+            limit=1,
+        )
+        return await self._get_first_cached("integrations", opta_id, params)
+
+    async def get_team_by_opta_id(self, opta_id: int) -> Optional[dict[str, Any]]:
+        params = DirectusQueryParams(
+            entity="teams",
+            filter={"integration": {"opta_id": {"_eq": opta_id}}},
+            limit=1,
+            fields=record_fields("teams"),
+        )
+        return await self._get_first_cached("teams", opta_id, params)
+
+    async def get_player_by_opta_id(self, opta_id: int) -> Optional[dict[str, Any]]:
+        params = DirectusQueryParams(
+            entity="players",
+            filter={"integration": {"opta_id": {"_eq": opta_id}}},
+            limit=1,
+            fields=record_fields("players"),
+        )
+        return await self._get_first_cached("players", opta_id, params)
+
+    async def get_event_type_by_opta_id(self, opta_id: int) -> Optional[dict[str, Any]]:
+        params = DirectusQueryParams(
+            entity="opta_event_types",
+            filter={"opta_id": {"_eq": opta_id}},
+            limit=1,
+            fields=record_fields("opta_event_types"),
+        )
+        return await self._get_first_cached("opta_event_types", opta_id, params)
+
+    async def get_event_qualifiers_by_opta_ids(
+        self, opta_ids: Iterable[int]
+    ) -> dict[Any, dict[str, Any]]:
+        return await self._get_many_cached(
+            "opta_event_qualifiers", "opta_event_qualifiers", opta_ids
+        )
+
+    async def get_event_types_by_opta_ids(
+        self, opta_ids: Iterable[int]
+    ) -> dict[Any, dict[str, Any]]:
+        return await self._get_many_cached(
+            "opta_event_types", "opta_event_types", opta_ids
+        )
+
+    async def get_teams_by_opta_ids(
+        self, opta_ids: Iterable[str]
+    ) -> dict[Any, dict[str, Any]]:
+        return await self._get_many_cached("teams", "teams", opta_ids, integration=True)
+
+    async def get_players_by_opta_ids(
+        self, opta_ids: Iterable[str]
+    ) -> dict[Any, dict[str, Any]]:
+        return await self._get_many_cached(
+            "players", "players", opta_ids, integration=True
+        )
@@ -1,19 +1,59 @@
+import asyncio
 import json
 import os
-from typing import Any, Optional
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Optional
 
 import httpx
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
+from directus.records import record_fields, to_plain, to_record
+from directus.redis_cache import RedisDirectusCache
+from utils.feature_flags import flags
+from utils.logger import setup_logger
+from utils.metrics import DIRECTUS_LOOKUPS_SAVED_TOTAL
+
+if TYPE_CHECKING:
+    from directus.snapshot import ReferenceSnapshot
+
 # Load environment variables from .env file
 load_dotenv()
 
+logger = setup_logger("directus_service")
+
+DEFAULT_CACHE_TTL = int(os.getenv("DIRECTUS_CACHE_TTL", "300"))
+DEFAULT_CACHE_MAXSIZE = int(os.getenv("DIRECTUS_CACHE_MAXSIZE", "5000"))
+# Event types and qualifiers are static reference data, so they can live
+# much longer in the cache than players or teams.
+REFERENCE_CACHE_TTL = int(os.getenv("DIRECTUS_REFERENCE_CACHE_TTL", "86400"))
+REFERENCE_ENTITIES = {"opta_event_types", "opta_event_qualifiers"}
+BATCH_CHUNK_SIZE = int(os.getenv("DIRECTUS_BATCH_CHUNK_SIZE", "100"))
+
+HTTP_TIMEOUT = float(os.getenv("DIRECTUS_HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("DIRECTUS_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("DIRECTUS_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("DIRECTUS_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("DIRECTUS_HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_MAX_RETRIES = int(os.getenv("DIRECTUS_HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_SECONDS = float(os.getenv("DIRECTUS_HTTP_BACKOFF_SECONDS", "0.5"))
+# Upper bound on a Retry-After, so a proxy cannot park a worker for minutes
+HTTP_MAX_RETRY_DELAY = float(os.getenv("DIRECTUS_HTTP_MAX_RETRY_DELAY", "30"))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Opta ids without a Directus record are remembered for a short while so they
+# are not requested again on every event.
+NEGATIVE_CACHE_TTL = int(os.getenv("DIRECTUS_NEGATIVE_CACHE_TTL", "60"))
+COALESCE_WAIT_SECONDS = float(os.getenv("DIRECTUS_COALESCE_WAIT_SECONDS", "15"))
+
 
 class DirectusQueryParams(BaseModel):
     entity: str
     filter: Optional[dict[str, Any]] = None
     limit: Optional[int] = None
+    offset: Optional[int] = None
     sort: Optional[str] = None
     fields: Optional[str] = None
     aggregation_type: Optional[str] = None
@@ -21,8 +61,367 @@ class DirectusQueryParams(BaseModel):
     group_by: Optional[str] = None
 
 
-class DirectusService:
-    def __init__(self, base_url: Optional[str] = None, token: Optional[str] = None):
+class TTLCache:
+    """
+    Thread-safe in-process cache with per-entry TTL and LRU eviction.
+
+    Keys are ``(entity, opta_id)`` tuples so a whole entity can be invalidated
+    at once.
+    """
+
+    def __init__(
+        self, maxsize: int = DEFAULT_CACHE_MAXSIZE, ttl: float = DEFAULT_CACHE_TTL
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        Look up a key.
+
+        :return: Tuple (found, value). ``found`` is False for missing or expired keys
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(
+        self, entity: Optional[str] = None, opta_id: Optional[Any] = None
+    ) -> int:
+        """
+        Drop cached entries.
+
+        :param entity: Only drop entries of this entity. Drops everything if omitted
+        :param opta_id: Only drop the entry for this Opta ID (requires ``entity``)
+        :return: Number of entries removed
+        """
+        with self._lock:
+            if entity is None:
+                removed = len(self._data)
+                self._data.clear()
+                return removed
+            if opta_id is not None:
+                return 1 if self._data.pop((entity, opta_id), None) else 0
+            keys = [k for k in self._data if k[0] == entity]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def build_query(params: DirectusQueryParams) -> dict[str, Any]:
+    query = {}
+
+    if params.filter:
+        query["filter"] = json.dumps(params.filter)  # ✅ Proper stringified JSON
+    if params.limit:
+        query["limit"] = params.limit
+    if params.offset:
+        query["offset"] = params.offset
+    if params.sort:
+        query["sort"] = params.sort
+    if params.fields:
+        query["fields"] = params.fields
+    if params.aggregation_type and params.aggregation_field:
+        query[f"aggregate[{params.aggregation_type}]"] = params.aggregation_field
+    if params.group_by:
+        query["groupBy[]"] = params.group_by
+    return query
+
+
+def cache_ttl(entity: str) -> Optional[float]:
+    return REFERENCE_CACHE_TTL if entity in REFERENCE_ENTITIES else None
+
+
+def batch_params(
+    entity: str, opta_ids: list[Any], integration: bool = False
+) -> DirectusQueryParams:
+    id_filter = {"opta_id": {"_in": opta_ids}}
+    return DirectusQueryParams(
+        entity=entity,
+        filter={"integration": id_filter} if integration else id_filter,
+        limit=-1,
+        fields=record_fields(entity),
+    )
+
+
+def match_batch(
+    opta_ids: list[Any], items: list[dict[str, Any]], integration: bool = False
+) -> dict[Any, dict[str, Any]]:
+    """Map the items of a batch response back to the requested Opta IDs."""
+    by_id = {}
+    for item in items:
+        source = (item.get("integration") or {}) if integration else item
+        by_id.setdefault(str(source.get("opta_id")), item)
+    return {i: by_id[str(i)] for i in opta_ids if str(i) in by_id}
+
+
+def client_options() -> dict[str, Any]:
+    """Connection pool, keep-alive and timeout settings for the httpx clients."""
+    return {
+        "timeout": httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "http2": flags.directus_http2,
+    }
+
+
+def retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """
+    Exponential backoff with jitter, honouring Retry-After on 429/503 up to
+    HTTP_MAX_RETRY_DELAY.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), HTTP_MAX_RETRY_DELAY)
+    return HTTP_BACKOFF_SECONDS * (2**attempt) + random.uniform(0, 0.1)
+
+
+class InFlightRequests:
+    """
+    Single-flight bookkeeping: the first caller of a lookup claims it and the
+    concurrent callers of the same lookup wait for it instead of sending
+    their own request.
+    """
+
+    def __init__(self, event_factory: Callable[[], Any] = threading.Event):
+        """
+        :param event_factory: threading.Event for the sync service,
+            asyncio.Event for the async one
+        """
+        self.coalesced = 0
+        self._event_factory = event_factory
+        self._events: dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def claim(
+        self, cache_key: str, opta_ids: Iterable[Any]
+    ) -> tuple[list[Any], list[Any]]:
+        """
+        :return: Tuple (own, waiting) with the ids this caller has to fetch and
+            the events of the ids another caller is already fetching
+        """
+        own, waiting = [], []
+        with self._lock:
+            for opta_id in opta_ids:
+                event = self._events.get((cache_key, opta_id))
+                if event is None:
+                    self._events[(cache_key, opta_id)] = self._event_factory()
+                    own.append(opta_id)
+                else:
+                    waiting.append(event)
+            self.coalesced += len(waiting)
+        if waiting:
+            DIRECTUS_LOOKUPS_SAVED_TOTAL.labels(
+                entity=cache_key, reason="coalesced"
+            ).inc(len(waiting))
+        return own, waiting
+
+    def release(self, cache_key: str, opta_ids: Iterable[Any]) -> None:
+        with self._lock:
+            for opta_id in opta_ids:
+                event = self._events.pop((cache_key, opta_id), None)
+                if event is not None:
+                    event.set()
+
+    @staticmethod
+    def wait(events: list[Any], timeout: float = COALESCE_WAIT_SECONDS) -> None:
+        deadline = time.monotonic() + timeout
+        for event in events:
+            event.wait(max(0.0, deadline - time.monotonic()))
+
+    @staticmethod
+    async def wait_async(
+        events: list[Any], timeout: float = COALESCE_WAIT_SECONDS
+    ) -> None:
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(event.wait() for event in events)), timeout
+            )
+        except asyncio.TimeoutError:
+            pass
+
+
+class CachedLookupsMixin:
+    """
+    Lookup cache layers shared by the sync and async services: the
+    in-process TTLCache first, then the optional local snapshot, then the
+    optional Redis cache shared by all worker replicas. Ids unknown to
+    Directus are cached as None for NEGATIVE_CACHE_TTL seconds.
+    """
+
+    cache: TTLCache
+    snapshot: Optional["ReferenceSnapshot"]
+    shared_cache: Optional[RedisDirectusCache]
+    typed_records: bool
+    in_flight: InFlightRequests
+    negative_hits: int
+
+    def _init_lookup_cache(
+        self,
+        cache: Optional[TTLCache],
+        shared_cache: Optional[RedisDirectusCache],
+        snapshot: Optional["ReferenceSnapshot"],
+        event_factory: Callable[[], Any],
+    ) -> None:
+        self.cache = cache if cache is not None else TTLCache()
+        self.shared_cache = shared_cache
+        self.snapshot = snapshot
+        self.typed_records = not flags.directus_dict_records
+        self.in_flight = InFlightRequests(event_factory)
+        self.negative_hits = 0
+
+    def materialize(self, entity: str, item: dict[str, Any]) -> Any:
+        """
+        Turn a Directus item into its compact record (Player, Team, ...), or
+        keep the plain dict when typed records are disabled.
+        """
+        return to_record(entity, item) if self.typed_records else item
+
+    def _uses_shared_cache(self, cache_key: str) -> bool:
+        return self.shared_cache is not None and self.shared_cache.handles(cache_key)
+
+    def _cache_get_many(
+        self, cache_key: str, opta_ids: Iterable[Any], ttl: Optional[float] = None
+    ) -> tuple[dict[Any, Any], list[Any]]:
+        """
+        :return: Tuple (cached, missing) where cached maps opta_id -> value and
+            missing lists the ids that have to be fetched from Directus
+        """
+        cached = {}
+        missing = []
+        for opta_id in dict.fromkeys(i for i in opta_ids if i is not None):
+            found, value = self.cache.get((cache_key, opta_id))
+            if not found:
+                missing.append(opta_id)
+            elif value is None:
+                self._count_negative_hit(cache_key)
+            else:
+                cached[opta_id] = value
+
+        if missing and self.snapshot is not None and self.snapshot.handles(cache_key):
+            not_in_snapshot = []
+            for opta_id in missing:
+                item = self.snapshot.get(cache_key, opta_id)
+                if item is None:
+                    not_in_snapshot.append(opta_id)
+                    continue
+                cached[opta_id] = self.materialize(cache_key, item)
+                self.cache.set((cache_key, opta_id), cached[opta_id], ttl=ttl)
+            missing = not_in_snapshot
+
+        if missing and self._uses_shared_cache(cache_key):
+            shared = self.shared_cache.get_many(cache_key, missing)
+            for opta_id, value in shared.items():
+                if value is None:
+                    self._count_negative_hit(cache_key)
+                    self.cache.set((cache_key, opta_id), None, ttl=NEGATIVE_CACHE_TTL)
+                    continue
+                cached[opta_id] = self.materialize(cache_key, value)
+                self.cache.set((cache_key, opta_id), cached[opta_id], ttl=ttl)
+            missing = [i for i in missing if i not in shared]
+        return cached, missing
+
+    def _count_negative_hit(self, cache_key: str) -> None:
+        self.negative_hits += 1
+        DIRECTUS_LOOKUPS_SAVED_TOTAL.labels(
+            entity=cache_key, reason="negative_hit"
+        ).inc()
+
+    def _cache_set_many(
+        self, cache_key: str, items: dict[Any, Any], ttl: Optional[float] = None
+    ) -> None:
+        for opta_id, value in items.items():
+            self.cache.set((cache_key, opta_id), value, ttl=ttl)
+        if self._uses_shared_cache(cache_key):
+            plain = {opta_id: to_plain(value) for opta_id, value in items.items()}
+            self.shared_cache.set_many(cache_key, plain, ttl=ttl)
+
+    def _cache_results(
+        self,
+        cache_key: str,
+        opta_ids: Iterable[Any],
+        found: dict[Any, Any],
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Cache the found items, and the requested ids that were not found as None."""
+        self._cache_set_many(cache_key, found, ttl=ttl)
+        not_found = {opta_id: None for opta_id in opta_ids if opta_id not in found}
+        self._cache_set_many(cache_key, not_found, ttl=NEGATIVE_CACHE_TTL)
+
+    def invalidate_cache(
+        self, entity: Optional[str] = None, opta_id: Optional[Any] = None
+    ) -> int:
+        """
+        Drop cached lookups, e.g. after a player or team was edited in Directus.
+
+        :param entity: Cache key of the lookup ("players", "teams", ...). All if omitted
+        :param opta_id: Only drop the entry for this Opta ID
+        :return: Number of entries removed
+        """
+        removed = self.cache.invalidate(entity, opta_id)
+        if self.snapshot is not None:
+            self.snapshot.discard(entity, opta_id)
+        if self.shared_cache is not None:
+            removed += self.shared_cache.invalidate(entity, opta_id)
+        return removed
+
+    def cache_stats(self) -> dict[str, int]:
+        return {
+            **self.cache.stats(),
+            "negative_hits": self.negative_hits,
+            "coalesced": self.in_flight.coalesced,
+        }
+
+
+class DirectusService(CachedLookupsMixin):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        token: Optional[str] = None,
+        cache: Optional[TTLCache] = None,
+        shared_cache: Optional[RedisDirectusCache] = None,
+        snapshot: Optional["ReferenceSnapshot"] = None,
+    ):
         if not token:
             token = os.getenv("DIRECTUS_TOKEN")
         if not base_url:
@@ -32,36 +431,169 @@ class DirectusService:
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
         }
+        self._init_lookup_cache(cache, shared_cache, snapshot, threading.Event)
+        self._client: Optional[httpx.Client] = None
+        self._client_pid: Optional[int] = None
+
+    @property
+    def client(self) -> httpx.Client:
+        """
+        Long-lived pooled client, created on first use. A forked child gets
+        its own client instead of sharing the parent's sockets.
+        """
+        if self._client is None or self._client_pid != os.getpid():
+            self._client = httpx.Client(
+                base_url=self.base_url, headers=self.headers, **client_options()
+            )
+            self._client_pid = os.getpid()
+        return self._client
+
+    def close(self) -> None:
+        if self._client is not None and self._client_pid == os.getpid():
+            self._client.close()
+        self._client = None
+        self._client_pid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _request(self, path: str, query: dict[str, Any]) -> httpx.Response:
+        """GET with retry and exponential backoff on transport errors, 5xx and 429."""
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = self.client.get(path, params=query)
+            except httpx.TransportError as e:
+                if attempt >= HTTP_MAX_RETRIES:
+                    raise
+                logger.warning(f"⚠️ Directus request to {path} failed: {e}")
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= HTTP_MAX_RETRIES
+                ):
+                    response.raise_for_status()
+                    return response
+            delay = retry_delay(attempt, response)
+            attempt += 1
+            logger.warning(
+                f"🔁 Retrying Directus request to {path} in {delay:.2f}s "
+                f"(attempt {attempt}/{HTTP_MAX_RETRIES})"
+            )
+            time.sleep(delay)
 
     def get_items(self, params: DirectusQueryParams) -> list:
-        url = f"{self.base_url}/items/{params.entity}"
-        query = {}
-
-        if params.filter:
-            query["filter"] = json.dumps(params.filter)  # ✅ Proper stringified JSON
-        if params.limit:
-            query["limit"] = params.limit
-        if params.sort:
-            query["sort"] = params.sort
-        if params.fields:
-            query["fields"] = params.fields
-        if params.aggregation_type and params.aggregation_field:
-            query[f"aggregate[{params.aggregation_type}]"] = params.aggregation_field
-        if params.group_by:
-            query["groupBy[]"] = params.group_by
-
-        response = httpx.get(url, headers=self.headers, params=query)
-        response.raise_for_status()
+        response = self._request(f"/items/{params.entity}", build_query(params))
         return response.json()["data"]
 
+    def get_all_items(self, params: DirectusQueryParams, page_size: int = 500) -> list:
+        """
+        Page through a whole collection using limit/offset.
+
+        :param params: Query params; ``limit`` and ``offset`` are managed here
+        :param page_size: Number of items requested per page
+        :return: All matching items
+        """
+        items = []
+        offset = 0
+        while True:
+            page = self.get_items(
+                params.model_copy(update={"limit": page_size, "offset": offset})
+            )
+            items.extend(page)
+            if len(page) < page_size:
+                return items
+            offset += page_size
+
+    def _get_first_cached(
+        self, cache_key: str, opta_id: Any, params: DirectusQueryParams
+    ) -> Optional[dict[str, Any]]:
+        ttl = cache_ttl(params.entity)
+        cached, missing = self._cache_get_many(cache_key, [opta_id], ttl=ttl)
+        if not missing:
+            return cached.get(opta_id)
+        own, waiting = self.in_flight.claim(cache_key, missing)
+        if waiting:
+            self.in_flight.wait(waiting)
+            cached, missing = self._cache_get_many(cache_key, [opta_id], ttl=ttl)
+            if not missing:
+                return cached.get(opta_id)
+        try:
+            results = self.get_items(params)
+            value = self.materialize(params.entity, results[0]) if results else None
+            found = {opta_id: value} if value is not None else {}
+            self._cache_results(cache_key, [opta_id], found, ttl=ttl)
+        finally:
+            self.in_flight.release(cache_key, own)
+        return value
+
+    def _fetch_many(
+        self,
+        cache_key: str,
+        entity: str,
+        opta_ids: list[Any],
+        integration: bool,
+        ttl: Optional[float],
+    ) -> dict[Any, Any]:
+        results = {}
+        for start in range(0, len(opta_ids), BATCH_CHUNK_SIZE):
+            chunk = opta_ids[start : start + BATCH_CHUNK_SIZE]
+            items = self.get_items(batch_params(entity, chunk, integration))
+            found = {
+                opta_id: self.materialize(entity, item)
+                for opta_id, item in match_batch(chunk, items, integration).items()
+            }
+            self._cache_results(cache_key, chunk, found, ttl=ttl)
+            results.update(found)
+        return results
+
+    def _get_many_cached(
+        self,
+        cache_key: str,
+        entity: str,
+        opta_ids: Iterable[Any],
+        integration: bool = False,
+    ) -> dict[Any, dict[str, Any]]:
+        """
+        Resolve many Opta IDs with one ``_in`` filtered request per chunk.
+        Ids another thread is already fetching are waited for, not requested.
+
+        :param cache_key: Cache namespace shared with the single-item lookup
+        :param entity: Directus collection to query
+        :param opta_ids: Opta IDs to resolve; None values and duplicates are ignored
+        :param integration: Match on ``integration.opta_id`` instead of ``opta_id``
+        :return: Dict of opta_id -> item for the ids that were found
+        """
+        ttl = cache_ttl(entity)
+        results, missing = self._cache_get_many(cache_key, opta_ids, ttl=ttl)
+        own, waiting = self.in_flight.claim(cache_key, missing)
+        try:
+            results.update(self._fetch_many(cache_key, entity, own, integration, ttl))
+        finally:
+            self.in_flight.release(cache_key, own)
+        if waiting:
+            self.in_flight.wait(waiting)
+            others = [i for i in missing if i not in own]
+            cached, leftover = self._cache_get_many(cache_key, others, ttl=ttl)
+            results.update(cached)
+            # Only left over when the other request failed or timed out
+            results.update(
+                self._fetch_many(cache_key, entity, leftover, integration, ttl)
+            )
+        return results
+
     def get_event_qualifier_by_opta_id(self, opta_id: int) -> Optional[dict[str, Any]]:
         params = DirectusQueryParams(
             entity="opta_event_qualifiers",
             filter={"opta_id": {"_eq": opta_id}},
             limit=1,
+            fields=record_fields("opta_event_qualifiers"),
         )
-        results = self.get_items(params)
-        return results[0] if results else None
+        return self._get_first_cached("opta_event_qualifiers", opta_id, params)
 
     def get_integration_by_opta_id(self, opta_id: int) -> Optional[dict[str, Any]]:
         params = DirectusQueryParams(
@@ -69,26 +601,25 @@ class DirectusService:
             filter={"opta_id": {"_eq": opta_id}},
             limit=1,
         )
-        results = self.get_items(params)
-        return results[0] if results else None
+        return self._get_first_cached("integrations", opta_id, params)
 
     def get_team_by_opta_id(self, opta_id: int) -> Optional[dict[str, Any]]:
         params = DirectusQueryParams(
             entity="teams",
             filter={"integration": {"opta_id": {"_eq": opta_id}}},
             limit=1,
+            fields=record_fields("teams"),
         )
-        results = self.get_items(params)
-        return results[0] if results else None
+        return self._get_first_cached("teams", opta_id, params)
 
     def get_player_by_opta_id(self, opta_id: int) -> Optional[dict[str, Any]]:
         params = DirectusQueryParams(
             entity="players",
             filter={"integration": {"opta_id": {"_eq": opta_id}}},
             limit=1,
+            fields=record_fields("players"),
         )
-        results = self.get_items(params)
-        return results[0] if results else None
+        return self._get_first_cached("players", opta_id, params)
 
     def get_player_by_integration_id(self, opta_id: int) -> Optional[dict[str, Any]]:
         params = DirectusQueryParams(
@@ -96,17 +627,65 @@ class DirectusService:
             filter={"opta_id": {"_eq": opta_id}},
             limit=1,
         )
-        results = self.get_items(params)
-        return results[0] if results else None
+        return self._get_first_cached("teams_by_integration_id", opta_id, params)
 
     def get_event_type_by_opta_id(self, opta_id: int) -> Optional[dict[str, Any]]:
         params = DirectusQueryParams(
             entity="opta_event_types",
             filter={"opta_id": {"_eq": opta_id}},
             limit=1,
+            fields=record_fields("opta_event_types"),
+        )
+        return self._get_first_cached("opta_event_types", opta_id, params)
+
+    def get_event_qualifiers_by_opta_ids(
+        self, opta_ids: Iterable[int]
+    ) -> dict[Any, dict[str, Any]]:
+        return self._get_many_cached(
+            "opta_event_qualifiers", "opta_event_qualifiers", opta_ids
+        )
+
+    def get_event_types_by_opta_ids(
+        self, opta_ids: Iterable[int]
+    ) -> dict[Any, dict[str, Any]]:
+        return self._get_many_cached("opta_event_types", "opta_event_types", opta_ids)
+
+    def get_teams_by_opta_ids(
+        self, opta_ids: Iterable[str]
+    ) -> dict[Any, dict[str, Any]]:
+        return self._get_many_cached("teams", "teams", opta_ids, integration=True)
+
+    def get_players_by_opta_ids(
+        self, opta_ids: Iterable[str]
+    ) -> dict[Any, dict[str, Any]]:
+        return self._get_many_cached("players", "players", opta_ids, integration=True)
+
+    def get_players_by_team(self, team_id: Any) -> dict[Any, dict[str, Any]]:
+        """
+        Load a whole squad with one request.
+
+        :param team_id: Directus id of the team (not its Opta ID)
+        :return: Dict of player opta_id -> player, also written to the lookup cache
+        """
+        squad = self.snapshot.get_squad(team_id) if self.snapshot else []
+        if squad:
+            return {
+                player["opta_id"]: self.materialize("players", player)
+                for player in squad
+            }
+        params = DirectusQueryParams(
+            entity="players",
+            filter={"team": {"_eq": team_id}},
+            limit=-1,
+            fields=record_fields("players"),
         )
-        results = self.get_items(params)
-        return results[0] if results else None
+        players = {}
+        for player in self.get_items(params):
+            opta_id = (player.get("integration") or {}).get("opta_id")
+            if opta_id is not None:
+                players[opta_id] = self.materialize("players", player)
+        self._cache_set_many("players", players)
+        return players
 
 
 if __name__ == "__main__":
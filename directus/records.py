@@ -0,0 +1,99 @@
+from dataclasses import dataclass, fields
+from typing import Any, ClassVar, Optional
+
+
+class Record:
+    """
+    Base class of the compact Directus records.
+
+    Only the projected columns are kept, in ``__slots__``. ``get`` mirrors the
+    dict API so code written against the raw Directus dicts keeps working.
+    """
+
+    __slots__ = ()
+    FIELDS: ClassVar[str] = "*"
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]):
+        integration = data.get("integration")
+        values = {}
+        for field in fields(cls):
+            value = data.get(field.name)
+            if field.name == "opta_id" and value is None:
+                # Players and teams carry their Opta ID on the integration
+                value = integration.get("opta_id") if integration else None
+            values[field.name] = value
+        return cls(**values)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+
+@dataclass
+class Player(Record):
+    __slots__ = ("id", "opta_id", "name", "photo", "team")
+    FIELDS: ClassVar[str] = "id,name,photo,team,integration.opta_id"
+
+    id: Any
+    opta_id: Optional[str]
+    name: Optional[str]
+    photo: Optional[str]
+    team: Any
+
+
+@dataclass
+class Team(Record):
+    __slots__ = ("id", "opta_id", "name", "goal_template")
+    FIELDS: ClassVar[str] = "id,name,goal_template,integration.opta_id"
+
+    id: Any
+    opta_id: Optional[str]
+    name: Optional[str]
+    goal_template: Optional[str]
+
+
+@dataclass
+class EventType(Record):
+    __slots__ = ("id", "opta_id", "name")
+    FIELDS: ClassVar[str] = "id,opta_id,name"
+
+    id: Any
+    opta_id: Any
+    name: Optional[str]
+
+
+@dataclass
+class Qualifier(Record):
+    __slots__ = ("id", "opta_id", "name")
+    FIELDS: ClassVar[str] = "id,opta_id,name"
+
+    id: Any
+    opta_id: Any
+    name: Optional[str]
+
+
+RECORD_TYPES: dict[str, type[Record]] = {
+    "players": Player,
+    "teams": Team,
+    "opta_event_types": EventType,
+    "opta_event_qualifiers": Qualifier,
+}
+
+
+def record_fields(entity: str) -> Optional[str]:
+    """Columns requested from Directus for an entity, None for all of them."""
+    record_type = RECORD_TYPES.get(entity)
+    return record_type.FIELDS if record_type else None
+
+
+def to_record(entity: str, data: dict[str, Any]) -> Any:
+    record_type = RECORD_TYPES.get(entity)
+    return record_type.from_dict(data) if record_type else data
+
+
+def to_plain(value: Any) -> Any:
+    """Turn a record back into a JSON serializable dict; other values pass through."""
+    return value.to_dict() if isinstance(value, Record) else value
@@ -0,0 +1,125 @@
+import json
+import os
+import sys
+from typing import Any, Iterable, Optional
+
+import redis
+from dotenv import load_dotenv
+
+from utils.logger import setup_logger
+
+load_dotenv()
+
+logger = setup_logger("directus_service")
+
+# Bump when the shape of cached records changes so replicas running the new
+# code never read entries written by the old one.
+CACHE_SCHEMA_VERSION = 2
+REDIS_CACHE_URL = os.getenv("DIRECTUS_CACHE_REDIS_URL", "redis://localhost:6379/0")
+REDIS_CACHE_PREFIX = os.getenv("DIRECTUS_CACHE_REDIS_PREFIX", "directus")
+REDIS_CACHE_TTL = int(os.getenv("DIRECTUS_CACHE_REDIS_TTL", "3600"))
+SHARED_ENTITIES = {"players", "teams", "integrations", "opta_event_qualifiers"}
+
+
+class RedisDirectusCache:
+    """
+    Second-level Directus lookup cache shared by every worker replica.
+
+    Keys look like ``directus:v2:players:<opta_id>`` and hold the JSON encoded
+    record. Redis failures are logged and treated as cache misses so a Redis
+    outage only costs extra Directus requests.
+    """
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        url: str = REDIS_CACHE_URL,
+        prefix: str = REDIS_CACHE_PREFIX,
+        ttl: int = REDIS_CACHE_TTL,
+        version: int = CACHE_SCHEMA_VERSION,
+        entities: Iterable[str] = SHARED_ENTITIES,
+    ):
+        """
+        :param client: Redis client to use, e.g. a fakeredis instance in tests
+        :param url: Redis URL used when no client is given
+        :param prefix: Key prefix shared by all entries
+        :param ttl: Expiry of each entry in seconds
+        :param version: Schema version embedded in every key
+        :param entities: Cache keys (entities) that are shared through Redis
+        """
+        self.client = client or redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.ttl = ttl
+        self.version = version
+        self.entities = set(entities)
+
+    def handles(self, entity: str) -> bool:
+        return entity in self.entities
+
+    def key(self, entity: str, opta_id: Any) -> str:
+        return f"{self.prefix}:v{self.version}:{entity}:{opta_id}"
+
+    def get_many(self, entity: str, opta_ids: list[Any]) -> dict[Any, Any]:
+        if not opta_ids:
+            return {}
+        try:
+            values = self.client.mget([self.key(entity, i) for i in opta_ids])
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Redis cache read failed: {e}")
+            return {}
+        return {i: json.loads(v) for i, v in zip(opta_ids, values) if v is not None}
+
+    def set_many(
+        self, entity: str, items: dict[Any, Any], ttl: Optional[int] = None
+    ) -> None:
+        if not items:
+            return
+        try:
+            with self.client.pipeline(transaction=False) as pipe:
+                for opta_id, value in items.items():
+                    pipe.set(
+                        self.key(entity, opta_id),
+                        json.dumps(value),
+                        ex=ttl or self.ttl,
+                    )
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Redis cache write failed: {e}")
+
+    def invalidate(
+        self, entity: Optional[str] = None, opta_id: Optional[Any] = None
+    ) -> int:
+        """
+        Delete shared entries of the current schema version.
+
+        :param entity: Only delete entries of this entity. Deletes all if omitted
+        :param opta_id: Only delete the entry for this Opta ID (requires ``entity``)
+        :return: Number of keys deleted, up to the failure if Redis failed
+        """
+        deleted = 0
+        try:
+            if entity and opta_id is not None:
+                return self.client.delete(self.key(entity, opta_id))
+            pattern = f"{self.prefix}:v{self.version}:{entity or '*'}:*"
+            batch = []
+            for key in self.client.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += self.client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += self.client.delete(*batch)
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Redis cache invalidation failed: {e}")
+        return deleted
+
+
+if __name__ == "__main__":
+    # Usage: python -m directus.redis_cache invalidate [entity] [opta_id]
+    if len(sys.argv) < 2 or sys.argv[1] != "invalidate":
+        print("Usage: python -m directus.redis_cache invalidate [entity] [opta_id]")
+        sys.exit(1)
+    _entity = sys.argv[2] if len(sys.argv) > 2 else None
+    _opta_id = sys.argv[3] if len(sys.argv) > 3 else None
+    removed = RedisDirectusCache().invalidate(_entity, _opta_id)
+    print(f"🧹 Removed {removed} cached Directus entries")
@@ -0,0 +1,182 @@
+import os
+import threading
+import weakref
+from typing import Any, Iterable, Optional
+
+from dotenv import load_dotenv
+
+from directus.directus_service import DirectusQueryParams, DirectusService
+from directus.records import record_fields
+from utils.logger import setup_logger
+
+load_dotenv()
+
+logger = setup_logger("reference_data")
+
+EVENT_TYPES_ENTITY = "opta_event_types"
+EVENT_QUALIFIERS_ENTITY = "opta_event_qualifiers"
+REFRESH_INTERVAL_SECONDS = int(os.getenv("REFERENCE_DATA_REFRESH_SECONDS", "3600"))
+
+
+def _key(opta_id: Any) -> str:
+    # Opta sends numeric ids while Directus may store them as strings
+    return str(opta_id)
+
+
+_instances: "weakref.WeakSet[ReferenceData]" = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for reference_data in list(_instances):
+        reference_data._reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class ReferenceData:
+    """
+    In-memory indexes of the static Opta lookup tables (event types and
+    qualifiers), keyed by opta_id and refreshed in the background.
+    """
+
+    def __init__(
+        self,
+        directus: DirectusService,
+        refresh_interval: int = REFRESH_INTERVAL_SECONDS,
+    ):
+        self.directus = directus
+        self.refresh_interval = refresh_interval
+        self.event_types: dict[str, Any] = {}
+        self.qualifiers: dict[str, Any] = {}
+        self.loaded = False
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        _instances.add(self)
+
+    def _reset_after_fork(self) -> None:
+        # The parent's refresh thread may have held the lock when the worker
+        # forked; it does not exist in the child and would never release it
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _fetch_index(self, entity: str) -> dict[str, dict[str, Any]]:
+        params = DirectusQueryParams(entity=entity, fields=record_fields(entity))
+        return {
+            _key(item["opta_id"]): self.directus.materialize(entity, item)
+            for item in self.directus.get_all_items(params)
+            if "opta_id" in item
+        }
+
+    def load(self) -> None:
+        """Fetch both collections and swap the indexes in one go."""
+        with self._load_lock:
+            event_types = self._fetch_index(EVENT_TYPES_ENTITY)
+            qualifiers = self._fetch_index(EVENT_QUALIFIERS_ENTITY)
+            self.event_types, self.qualifiers = event_types, qualifiers
+            self.loaded = True
+        logger.info(
+            f"📚 Loaded {len(event_types)} event types and "
+            f"{len(qualifiers)} qualifiers from Directus"
+        )
+
+    def load_snapshot(self, snapshot) -> None:
+        """Seed the indexes from a local ReferenceSnapshot instead of Directus."""
+        with self._load_lock:
+            self.event_types = {
+                _key(item["opta_id"]): self.directus.materialize(
+                    EVENT_TYPES_ENTITY, item
+                )
+                for item in snapshot.get_all(EVENT_TYPES_ENTITY)
+            }
+            self.qualifiers = {
+                _key(item["opta_id"]): self.directus.materialize(
+                    EVENT_QUALIFIERS_ENTITY, item
+                )
+                for item in snapshot.get_all(EVENT_QUALIFIERS_ENTITY)
+            }
+            self.loaded = True
+
+    def ensure_loaded(self) -> None:
+        if not self.loaded:
+            self.load()
+
+    def start_background_refresh(self) -> None:
+        """
+        Start the refresh thread. Safe to call again after a fork, where the
+        parent's thread no longer exists in the child; the lock and thread
+        state are reset in every forked child.
+        """
+        if self.refresh_interval <= 0:
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name="reference-data-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop_background_refresh(self) -> None:
+        self._stop.set()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.load()
+            except Exception as e:
+                logger.error(f"❌ Error refreshing reference data: {e}")
+
+    def resolve_missing(
+        self, type_ids: Iterable[Any], qualifier_ids: Iterable[Any]
+    ) -> None:
+        """
+        Fetch ids that are not indexed yet (e.g. added to Directus after the
+        last refresh) with one batch request per table and add them to the
+        indexes.
+        """
+        missing_types, missing_qualifiers = self.missing_ids(type_ids, qualifier_ids)
+        self.add(
+            event_types=(
+                self.directus.get_event_types_by_opta_ids(missing_types)
+                if missing_types
+                else {}
+            ),
+            qualifiers=(
+                self.directus.get_event_qualifiers_by_opta_ids(missing_qualifiers)
+                if missing_qualifiers
+                else {}
+            ),
+        )
+
+    def missing_ids(
+        self, type_ids: Iterable[Any], qualifier_ids: Iterable[Any]
+    ) -> tuple[set, set]:
+        self.ensure_loaded()
+        missing_types = {i for i in type_ids if _key(i) not in self.event_types}
+        missing_qualifiers = {
+            i for i in qualifier_ids if _key(i) not in self.qualifiers
+        }
+        return missing_types, missing_qualifiers
+
+    def add(
+        self,
+        event_types: Optional[dict[Any, dict[str, Any]]] = None,
+        qualifiers: Optional[dict[Any, dict[str, Any]]] = None,
+    ) -> None:
+        self.event_types.update({_key(k): v for k, v in (event_types or {}).items()})
+        self.qualifiers.update({_key(k): v for k, v in (qualifiers or {}).items()})
+
+    def get_event_type(self, opta_id: Any) -> Optional[dict[str, Any]]:
+        self.ensure_loaded()
+        return self.event_types.get(_key(opta_id))
+
+    def get_qualifier(self, opta_id: Any) -> Optional[dict[str, Any]]:
+        self.ensure_loaded()
+        return self.qualifiers.get(_key(opta_id))
+
+    def get_qualifier_name(self, opta_id: Any) -> str:
+        qualifier = self.get_qualifier(opta_id)
+        return qualifier.get("name") if qualifier else "Unknown"
@@ -0,0 +1,138 @@
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Optional
+
+from dotenv import load_dotenv
+
+from directus.directus_service import DirectusQueryParams, DirectusService
+from directus.records import record_fields, to_plain, to_record
+from utils.logger import setup_logger
+
+load_dotenv()
+
+logger = setup_logger("directus_snapshot")
+
+SNAPSHOT_PATH = os.getenv("DIRECTUS_SNAPSHOT_PATH", "data/directus_snapshot.sqlite")
+SNAPSHOT_ENTITIES = ("opta_event_types", "opta_event_qualifiers", "teams", "players")
+# Players and teams are only useful to the worker when they carry an Opta ID
+INTEGRATION_ENTITIES = {"teams", "players"}
+
+
+class ReferenceSnapshot:
+    """
+    Read-only copy of the Directus tables the worker needs, loaded from a
+    local SQLite file. Records are stored flattened (opta_id at top level).
+    """
+
+    def __init__(self, records: dict[str, dict[str, dict[str, Any]]], created_at=None):
+        self.records = records
+        self.created_at = created_at
+        self._squads: dict[str, list[dict[str, Any]]] = {}
+        for player in records.get("players", {}).values():
+            self._squads.setdefault(str(player.get("team")), []).append(player)
+
+    @classmethod
+    def load(cls, path: str = SNAPSHOT_PATH) -> Optional["ReferenceSnapshot"]:
+        """
+        :return: The snapshot, or None if the file does not exist
+        """
+        if not os.path.exists(path):
+            return None
+        started = time.perf_counter()
+        records: dict[str, dict[str, dict[str, Any]]] = {}
+        conn = sqlite3.connect(path)
+        try:
+            for entity, opta_id, data in conn.execute(
+                "SELECT entity, opta_id, data FROM records"
+            ):
+                records.setdefault(entity, {})[opta_id] = json.loads(data)
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'created_at'"
+            ).fetchone()
+        finally:
+            conn.close()
+        snapshot = cls(records, created_at=row[0] if row else None)
+        logger.info(
+            f"📦 Loaded Directus snapshot from {path} (created {snapshot.created_at}) "
+            f"in {(time.perf_counter() - started) * 1000:.1f} ms: "
+            + ", ".join(f"{len(v)} {k}" for k, v in records.items())
+        )
+        return snapshot
+
+    def handles(self, entity: str) -> bool:
+        return entity in self.records
+
+    def get(self, entity: str, opta_id: Any) -> Optional[dict[str, Any]]:
+        return self.records.get(entity, {}).get(str(opta_id))
+
+    def get_all(self, entity: str) -> list[dict[str, Any]]:
+        return list(self.records.get(entity, {}).values())
+
+    def get_squad(self, team_id: Any) -> list[dict[str, Any]]:
+        return self._squads.get(str(team_id), [])
+
+    def discard(self, entity: Optional[str] = None, opta_id: Any = None) -> None:
+        """Forget entries so the next lookup goes to Directus."""
+        if entity is None:
+            self.records.clear()
+        elif opta_id is None:
+            self.records.pop(entity, None)
+        else:
+            self.records.get(entity, {}).pop(str(opta_id), None)
+
+
+def dump_snapshot(directus: DirectusService, path: str = SNAPSHOT_PATH) -> int:
+    """
+    Dump the reference tables to a SQLite file, replacing it atomically.
+
+    :return: Number of records written
+    """
+    rows = []
+    for entity in SNAPSHOT_ENTITIES:
+        params = DirectusQueryParams(
+            entity=entity,
+            fields=record_fields(entity),
+            filter=(
+                {"integration": {"opta_id": {"_nnull": True}}}
+                if entity in INTEGRATION_ENTITIES
+                else None
+            ),
+        )
+        for item in directus.get_all_items(params):
+            record = to_plain(to_record(entity, item))
+            if record.get("opta_id") is None:
+                continue
+            rows.append((entity, str(record["opta_id"]), json.dumps(record)))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    with sqlite3.connect(tmp_path) as conn:
+        conn.execute(
+            "CREATE TABLE records ("
+            "entity TEXT, opta_id TEXT, data TEXT, PRIMARY KEY (entity, opta_id))"
+        )
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany("INSERT OR REPLACE INTO records VALUES (?, ?, ?)", rows)
+        conn.execute(
+            "INSERT INTO meta VALUES ('created_at', ?)",
+            (time.strftime("%Y-%m-%dT%H:%M:%S"),),
+        )
+    conn.close()
+    os.replace(tmp_path, path)
+    logger.info(f"📦 Wrote {len(rows)} records to {path}")
+    return len(rows)
+
+
+if __name__ == "__main__":
+    # Usage: python -m directus.snapshot dump [path]
+    if len(sys.argv) < 2 or sys.argv[1] != "dump":
+        print("Usage: python -m directus.snapshot dump [path]")
+        sys.exit(1)
+    _path = sys.argv[2] if len(sys.argv) > 2 else SNAPSHOT_PATH
+    with DirectusService() as service:
+        dump_snapshot(service, _path)
@@ -1,7 +1,8 @@
+import os
 from typing import Optional
 
 import gspread
-from gspread.utils import InsertDataOption
+from gspread.utils import InsertDataOption, fill_gaps, rowcol_to_a1
 
 from google.oauth2 import service_account
 
@@ -13,20 +14,45 @@ class GoogleSheetService:
         json_key_filename: str = "footballmad-52be88097f72.json",
     ):
         """
-        Initialize the GoogleSheetService.
+        Initialize the GoogleSheetService. Nothing is loaded or opened until
+        the first request, so building it is cheap and safe before a fork.
 
         :param sheet_id: The ID of the Google Sheet (from the URL)
         :param json_key_filename: Path to the service account JSON credentials
         """
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        credentials = service_account.Credentials.from_service_account_file(
-            json_key_filename, scopes=scopes
-        )
-        self.client = gspread.authorize(credentials)
-        self.sheet = self.client.open_by_key(sheet_id)
+        self.sheet_id = sheet_id
+        self.json_key_filename = json_key_filename
+        self._client = None
+        self._sheet = None
+        self._worksheets: dict = {}
+        # Rows read so far, by tab
+        self._rows: dict[Optional[str], list[list[str]]] = {}
+        self._pid = None
+
+    @property
+    def client(self) -> gspread.Client:
+        # An authorized session must not be shared with forked children
+        if self._client is None or self._pid != os.getpid():
+            scopes = [
+                "https://www.googleapis.com/auth/spreadsheets",
+                "https://www.googleapis.com/auth/drive",
+            ]
+            credentials = service_account.Credentials.from_service_account_file(
+                self.json_key_filename, scopes=scopes
+            )
+            self._client = gspread.authorize(credentials)
+            self._sheet = None
+            self._worksheets = {}
+            self._rows = {}
+            self._pid = os.getpid()
+        return self._client
+
+    @property
+    def sheet(self) -> gspread.Spreadsheet:
+        client = self.client
+        if self._sheet is None:
+            self._sheet = client.open_by_key(self.sheet_id)
+        return self._sheet
 
     def append_row(self, values: list, tab_name: Optional[str] = None):
         """
@@ -42,23 +68,102 @@ class GoogleSheetService:
         # else:
         #     print("❌ Failed to append row.")
 
-    def get_all_rows(self, tab_name: Optional[str] = None) -> list[list[str]]:
+    def append_rows(self, rows: list[list], tab_name: Optional[str] = None) -> dict:
+        """
+        Append several rows to the specified tab with a single request.
+
+        :param rows: A list of rows, each a list of values
+        :param tab_name: The name of the tab (sheet) to append to. Defaults to the first sheet.
+        :return: The API response; ``updates.updatedRange`` holds the rows written
+        """
+        worksheet = self._get_worksheet(tab_name)
+        return worksheet.append_rows(
+            rows, insert_data_option=InsertDataOption.insert_rows
+        )
+
+    def update_rows(self, rows: dict[int, list], tab_name: Optional[str] = None):
         """
-        Get all rows from the specified tab in the spreadsheet.
+        Overwrite several rows of the specified tab with a single request.
+
+        :param rows: Values of each row, by 1-based row number
+        :param tab_name: The name of the tab (sheet) to write to. Defaults to the first sheet.
+        """
+        worksheet = self._get_worksheet(tab_name)
+        worksheet.batch_update(
+            [
+                {
+                    "range": f"A{row_number}:{rowcol_to_a1(row_number, len(values))}",
+                    "values": [values],
+                }
+                for row_number, values in rows.items()
+            ]
+        )
+        cached = self._rows.get(tab_name)
+        if cached is not None:
+            for row_number, values in rows.items():
+                if row_number <= len(cached):
+                    cached[row_number - 1] = [
+                        "" if v is None else str(v) for v in values
+                    ]
+
+    def get_all_rows(
+        self, tab_name: Optional[str] = None, refresh: bool = False
+    ) -> list[list[str]]:
+        """
+        Get all rows from the specified tab in the spreadsheet. The rows are
+        cached: after the first read only rows appended since are fetched.
 
         :param tab_name: The name of the tab (sheet) to read from. Defaults to the first sheet.
+        :param refresh: Read the whole tab again, e.g. after rows were edited
+            or deleted by someone else
         :return: A list of rows, where each row is a list of strings
         """
+        if refresh:
+            self.refresh_rows(tab_name)
+        else:
+            self.get_new_rows(tab_name)
+        return list(self._rows[tab_name])
+
+    def get_new_rows(self, tab_name: Optional[str] = None) -> list[list[str]]:
+        """
+        Get the rows appended to the tab since it was last read, with one
+        request for just those rows. The first call reads the whole tab.
+
+        :param tab_name: The name of the tab (sheet) to read from. Defaults to the first sheet.
+        :return: The new rows, each a list of strings
+        """
+        # First, so a forked child drops the rows cached by its parent
+        worksheet = self._get_worksheet(tab_name)
+        if tab_name not in self._rows:
+            return list(self.refresh_rows(tab_name))
+        cached = self._rows[tab_name]
+        last_column = rowcol_to_a1(1, worksheet.col_count).rstrip("0123456789")
+        new_rows = worksheet.get(f"A{len(cached) + 1}:{last_column}")
+        if new_rows and cached:
+            new_rows = fill_gaps(new_rows, cols=len(cached[0]))
+        cached.extend(new_rows)
+        return list(new_rows)
+
+    def refresh_rows(self, tab_name: Optional[str] = None) -> list[list[str]]:
+        """Read the whole tab into the cache again."""
         worksheet = self._get_worksheet(tab_name)
-        return worksheet.get_all_values()
+        self._rows[tab_name] = worksheet.get_all_values()
+        return self._rows[tab_name]
 
     def _get_worksheet(self, tab_name: Optional[str] = None):
         """
         Helper to get the worksheet by tab name or return the first sheet if none provided.
+        Handles are cached so the spreadsheet metadata is only fetched once per tab.
         """
-        if tab_name:
-            return self.sheet.worksheet(tab_name)
-        return self.sheet.get_worksheet(0)
+        sheet = self.sheet
+        worksheet = self._worksheets.get(tab_name)
+        if worksheet is None:
+            if tab_name:
+                worksheet = sheet.worksheet(tab_name)
+            else:
+                worksheet = sheet.get_worksheet(0)
+            self._worksheets[tab_name] = worksheet
+        return worksheet
 
 
 if __name__ == "__main__":
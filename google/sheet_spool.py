@@ -0,0 +1,261 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+from gspread.exceptions import APIError
+
+from google.sheet_service import GoogleSheetService
+from google.sheet_upsert import SheetUpserter
+from utils.feature_flags import flags
+from utils.file_lock import locked_file
+from utils.logger import setup_logger
+from utils.metrics import timed
+from utils.rate_limiter import TokenBucket
+from utils.sqlite import SQLiteConnection
+
+load_dotenv()
+
+logger = setup_logger("sheet_spool")
+
+SHEET_SPOOL_PATH = os.getenv("SHEET_SPOOL_PATH", "data/sheet_spool.sqlite")
+SHEET_SPOOL_BATCH_SIZE = int(os.getenv("SHEET_SPOOL_BATCH_SIZE", "500"))
+SHEET_SPOOL_DRAIN_INTERVAL_SECONDS = float(
+    os.getenv("SHEET_SPOOL_DRAIN_INTERVAL_SECONDS", "2")
+)
+SHEET_SPOOL_MAX_BACKOFF_SECONDS = float(
+    os.getenv("SHEET_SPOOL_MAX_BACKOFF_SECONDS", "300")
+)
+# Client errors a retry may still get through
+RETRYABLE_CLIENT_STATUS_CODES = {408, 429}
+
+
+def is_rejected(e: Exception) -> bool:
+    """
+    Only a 4xx answer from Sheets (other than 408 and 429) rejects the rows
+    for good. Anything else, e.g. 5xx, network, Redis or credential errors,
+    may go away and is retried.
+    """
+    if not isinstance(e, APIError):
+        return False
+    status_code = getattr(e.response, "status_code", None)
+    return (
+        isinstance(status_code, int)
+        and 400 <= status_code < 500
+        and status_code not in RETRYABLE_CLIENT_STATUS_CODES
+    )
+
+
+class SheetSpool:
+    """
+    Durable queue of sheet rows in a local SQLite file. Writing a row is a
+    local commit, so persisting never waits for Google Sheets; ``SpoolDrainer``
+    appends the rows later and deletes them only once they were written.
+
+    Rows a drain rejected for good (e.g. a 400) are kept as failed instead of
+    blocking the queue; ``retry_failed`` puts them back.
+    """
+
+    def __init__(self, path: str = SHEET_SPOOL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # Durable once committed unless the host itself loses power
+        self._db = SQLiteConnection(
+            path,
+            schema="CREATE TABLE IF NOT EXISTS rows ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, tab_name TEXT, "
+            "row TEXT, created_at REAL, failed TEXT)",
+            synchronous="NORMAL",
+        )
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def put(self, rows: list[list], tab_name: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO rows (tab_name, row, created_at) VALUES (?, ?, ?)",
+                    [
+                        (tab_name or "", json.dumps(row, default=str), now)
+                        for row in rows
+                    ],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def peek(self, limit: int = SHEET_SPOOL_BATCH_SIZE) -> tuple:
+        """
+        :return: Tuple (tab_name, ids, rows) of the oldest pending rows of one
+            tab, in the order they were spooled; tab_name is None when empty
+        """
+        with self._lock:
+            first = self.conn.execute(
+                "SELECT tab_name FROM rows WHERE failed IS NULL ORDER BY id LIMIT 1"
+            ).fetchone()
+            if first is None:
+                return None, [], []
+            records = self.conn.execute(
+                "SELECT id, row FROM rows WHERE failed IS NULL AND tab_name = ? "
+                "ORDER BY id LIMIT ?",
+                (first[0], limit),
+            ).fetchall()
+        return (
+            first[0],
+            [record[0] for record in records],
+            [json.loads(record[1]) for record in records],
+        )
+
+    def ack(self, ids: list[int]) -> None:
+        with self._lock:
+            self.conn.executemany("DELETE FROM rows WHERE id = ?", [(i,) for i in ids])
+
+    def fail(self, ids: list[int], error: str) -> None:
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE rows SET failed = ? WHERE id = ?", [(error, i) for i in ids]
+            )
+
+    def retry_failed(self) -> int:
+        with self._lock:
+            return self.conn.execute(
+                "UPDATE rows SET failed = NULL WHERE failed IS NOT NULL"
+            ).rowcount
+
+    def counts(self) -> dict:
+        with self._lock:
+            pending, failed = self.conn.execute(
+                "SELECT COUNT(*) - COUNT(failed), COUNT(failed) FROM rows"
+            ).fetchone()
+        return {"pending": pending, "failed": failed}
+
+
+class SpoolDrainer:
+    """
+    Appends spooled rows to Google Sheets, one ``append_rows`` per batch.
+    Rows Sheets rejects with a 4xx are marked failed; any other error backs
+    off exponentially and keeps the rows. Delivery is at-least-once (a crash
+    between the append and the ack writes the batch again). Only one drainer
+    per spool file runs at a time.
+    """
+
+    def __init__(
+        self,
+        spool: SheetSpool,
+        sheet_service: GoogleSheetService,
+        rate_limiter: Optional[TokenBucket] = None,
+        batch_size: int = SHEET_SPOOL_BATCH_SIZE,
+        interval: float = SHEET_SPOOL_DRAIN_INTERVAL_SECONDS,
+        max_backoff: float = SHEET_SPOOL_MAX_BACKOFF_SECONDS,
+    ):
+        self.spool = spool
+        self.sheet_service = sheet_service
+        self.rate_limiter = rate_limiter
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self._failures = 0
+        self._retry_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def backoff(self) -> float:
+        return min(self.interval * 2**self._failures, self.max_backoff)
+
+    def drain(self) -> int:
+        """
+        Append pending rows until the spool is empty or Sheets fails.
+
+        :return: Number of rows written
+        """
+        if time.monotonic() < self._retry_at:
+            return 0
+        os.makedirs(os.path.dirname(self.spool.path) or ".", exist_ok=True)
+        # A record lock: a child forked while it is held does not inherit it
+        with locked_file(f"{self.spool.path}.drain.lock", blocking=False) as lock:
+            if lock is None:
+                # Another thread or process drains this spool
+                return 0
+            written = 0
+            while True:
+                tab_name, ids, rows = self.spool.peek(self.batch_size)
+                if not ids:
+                    return written
+                try:
+                    if self.rate_limiter:
+                        self.rate_limiter.acquire()
+                    with timed("sheets_append"):
+                        self.sheet_service.append_rows(rows, tab_name=tab_name or None)
+                except Exception as e:
+                    if is_rejected(e):
+                        logger.error(f"❌ {len(ids)} spooled rows rejected: {e}")
+                        self.spool.fail(ids, str(e))
+                        continue
+                    self._failures += 1
+                    delay = self.backoff()
+                    self._retry_at = time.monotonic() + delay
+                    logger.warning(
+                        f"⚠️ Sheets unavailable, retrying spooled rows in {delay:g}s: {e}"
+                    )
+                    return written
+                self.spool.ack(ids)
+                self._failures = 0
+                written += len(ids)
+                logger.info(f"✅ {len(ids)} spooled rows appended to {tab_name}")
+
+    def start(self) -> None:
+        if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+        self._pid = os.getpid()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._drain_loop, name="sheet-spool-drain", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread of this process after a last drain."""
+        self._stop.set()
+        if self._pid != os.getpid():
+            return
+        if self._thread:
+            self._thread.join(timeout=self.interval * 2)
+        try:
+            self.drain()
+        except Exception as e:
+            logger.error(f"❌ Error draining the sheet spool on shutdown: {e}")
+
+    def _drain_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.drain()
+            except Exception as e:
+                logger.error(f"❌ Error draining the sheet spool: {e}")
+
+
+if __name__ == "__main__":
+    # Usage: python -m google.sheet_spool status|drain|retry-failed
+    _commands = ("status", "drain", "retry-failed")
+    if len(sys.argv) < 2 or sys.argv[1] not in _commands:
+        print("Usage: python -m google.sheet_spool status|drain|retry-failed")
+        sys.exit(1)
+    _spool = SheetSpool()
+    if sys.argv[1] == "drain":
+        _writer = GoogleSheetService(os.getenv("GOOGLE_SHEET_ID"))
+        if flags.upsert_sheet_rows:
+            _writer = SheetUpserter(_writer)
+        print(f"✅ {SpoolDrainer(_spool, _writer).drain()} rows written")
+    elif sys.argv[1] == "retry-failed":
+        print(f"🔁 {_spool.retry_failed()} failed rows queued again")
+    print(f"📦 {_spool.counts()}")
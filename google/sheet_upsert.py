@@ -0,0 +1,128 @@
+import os
+import re
+import threading
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from google.sheet_service import GoogleSheetService
+from utils.logger import setup_logger
+from utils.rate_limiter import TokenBucket
+
+load_dotenv()
+
+logger = setup_logger("sheet_upsert")
+
+# 0-based columns identifying an event in the "game events" rows: opta_id and
+# fixture_id, see MatchEventService._process_single_event
+EVENT_KEY_COLUMNS = (5, 6)
+UPDATED_RANGE_PATTERN = re.compile(r"!\$?[A-Z]+\$?(\d+)")
+
+
+def row_key(row: list, key_columns: tuple = EVENT_KEY_COLUMNS) -> Optional[tuple]:
+    key = tuple(str(row[i]) if i < len(row) else "" for i in key_columns)
+    return key if any(key) else None
+
+
+class SheetUpserter:
+    """
+    Writes one row per event: rows of an event already in the sheet are
+    overwritten in place, new events are appended. An index of event key
+    -> row number is built per tab from one bulk read and kept up to date from
+    the API responses, so no lookup reads the sheet.
+
+    Has the ``append_rows`` signature of ``GoogleSheetService`` so it can stand
+    in for it in ``BufferedSheetWriter`` and ``SpoolDrainer``. Meant for a
+    single writer per sheet (e.g. the spool drainer); rows another process
+    appended are only known after ``refresh``.
+
+    One call makes up to three requests (index read, range update, append),
+    so it takes a token of ``rate_limiter`` before each of them; callers
+    must not take one for it.
+    """
+
+    def __init__(
+        self,
+        sheet_service: GoogleSheetService,
+        key_columns: tuple = EVENT_KEY_COLUMNS,
+        rate_limiter: Optional[TokenBucket] = None,
+    ):
+        self.sheet_service = sheet_service
+        self.key_columns = key_columns
+        self.rate_limiter = rate_limiter
+        self._indexes: dict[Optional[str], dict[tuple, int]] = {}
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+    def refresh(self, tab_name: Optional[str] = None) -> int:
+        """
+        Rebuild the index of a tab with one read of the whole tab, e.g. after
+        rows were edited by hand.
+
+        :return: Number of events indexed
+        """
+        self._acquire()
+        rows = self.sheet_service.get_all_rows(tab_name=tab_name, refresh=True)
+        index = {}
+        for row_number, row in enumerate(rows, start=1):
+            key = row_key(row, self.key_columns)
+            if key is not None:
+                index[key] = row_number
+        self._indexes[tab_name] = index
+        logger.info(f"📇 Indexed {len(index)} events of {tab_name}")
+        return len(index)
+
+    def _index(self, tab_name: Optional[str]) -> dict:
+        # Each forked child loads its own copy
+        if self._pid != os.getpid():
+            self._indexes, self._pid = {}, os.getpid()
+        if tab_name not in self._indexes:
+            self.refresh(tab_name)
+        return self._indexes[tab_name]
+
+    def upsert_rows(self, rows: list[list], tab_name: Optional[str] = None) -> dict:
+        """
+        Overwrite the rows of known events with one batched range write and
+        append the others with one ``append_rows``.
+
+        :return: Number of rows ``updated`` and ``appended``
+        """
+        with self._lock:
+            index = self._index(tab_name)
+            updates: dict[int, list] = {}
+            # Latest row of each new event, in first-seen order
+            new_rows: dict = {}
+            for row in rows:
+                key = row_key(row, self.key_columns)
+                if key is not None and key in index:
+                    updates[index[key]] = row
+                else:
+                    new_rows[key if key is not None else id(row)] = row
+            if updates:
+                self._acquire()
+                self.sheet_service.update_rows(updates, tab_name=tab_name)
+            if new_rows:
+                self._acquire()
+                response = self.sheet_service.append_rows(
+                    list(new_rows.values()), tab_name=tab_name
+                )
+                self._index_appended(index, list(new_rows), response)
+        return {"updated": len(updates), "appended": len(new_rows)}
+
+    append_rows = upsert_rows
+
+    def _acquire(self) -> None:
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+    @staticmethod
+    def _index_appended(index: dict, keys: list, response: Optional[dict]) -> None:
+        updated_range = ((response or {}).get("updates") or {}).get("updatedRange")
+        match = UPDATED_RANGE_PATTERN.search(updated_range or "")
+        if match is None:
+            logger.warning("⚠️ Append response has no range, new rows not indexed")
+            return
+        first_row = int(match.group(1))
+        for offset, key in enumerate(keys):
+            if isinstance(key, tuple):
+                index[key] = first_row + offset
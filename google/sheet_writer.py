@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from google.sheet_service import GoogleSheetService
+from utils.logger import setup_logger
+from utils.metrics import timed
+from utils.rate_limiter import TokenBucket
+
+load_dotenv()
+
+logger = setup_logger("sheet_writer")
+
+SHEETS_BUFFER_MAX_ROWS = int(os.getenv("SHEETS_BUFFER_MAX_ROWS", "100"))
+SHEETS_BUFFER_MAX_WAIT_SECONDS = float(os.getenv("SHEETS_BUFFER_MAX_WAIT_SECONDS", "5"))
+
+
+class BufferedSheetWriter:
+    """
+    Collects rows in memory and appends them to one tab with a single
+    ``append_rows`` request once ``max_rows`` are buffered or the oldest
+    row waited ``max_wait`` seconds. A background thread flushes quiet
+    periods; ``close`` flushes what is left on shutdown.
+
+    Rows of a failed flush stay buffered (in order) for the next one. Rows
+    still in memory are lost if the process is killed.
+    """
+
+    def __init__(
+        self,
+        sheet_service: GoogleSheetService,
+        tab_name: Optional[str] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_rows: int = SHEETS_BUFFER_MAX_ROWS,
+        max_wait: float = SHEETS_BUFFER_MAX_WAIT_SECONDS,
+    ):
+        self.sheet_service = sheet_service
+        self.tab_name = tab_name
+        self.rate_limiter = rate_limiter
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self._rows: list[list] = []
+        self._started: Optional[float] = None
+        self._lock = threading.Lock()
+        # Serializes flushes so rows reach the sheet in the order they were added
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def add_rows(self, rows: list[list]) -> None:
+        if not rows:
+            return
+        self._ensure_flusher()
+        with self._lock:
+            if not self._rows:
+                self._started = time.monotonic()
+            self._rows.extend(rows)
+            full = len(self._rows) >= self.max_rows
+        if full:
+            self.flush()
+
+    def add_row(self, row: list) -> None:
+        self.add_rows([row])
+
+    def flush(self) -> int:
+        """
+        Append every buffered row with one request.
+
+        :return: Number of rows written
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+                started, self._started = self._started, None
+            if not rows:
+                return 0
+            try:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
+                with timed("sheets_append"):
+                    self.sheet_service.append_rows(rows, tab_name=self.tab_name)
+            except Exception:
+                with self._lock:
+                    self._rows[:0] = rows
+                    self._started = started
+                raise
+        logger.info(f"✅ {len(rows)} buffered rows appended to {self.tab_name}")
+        return len(rows)
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows)
+
+    def _due(self) -> bool:
+        started = self._started
+        return started is not None and time.monotonic() - started >= self.max_wait
+
+    def _ensure_flusher(self) -> None:
+        # Threads do not survive fork; a prefork child starts its own, and
+        # does not flush rows it inherited from the parent's buffer
+        if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+        if self._pid != os.getpid():
+            self._rows, self._started = [], None
+            self._lock = threading.Lock()
+            self._flush_lock = threading.Lock()
+        self._pid = os.getpid()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._flush_loop, name="sheet-writer-flush", daemon=True
+        )
+        self._thread.start()
+
+    def _flush_loop(self) -> None:
+        interval = max(0.1, self.max_wait / 4)
+        while not self._stop.wait(interval):
+            if not self._due():
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ Error flushing rows to Google Sheets: {e}")
+
+    def close(self) -> None:
+        """Stop the flush thread and write what is still buffered."""
+        self._stop.set()
+        if self._pid != os.getpid():
+            return
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"❌ {self.pending} rows not written on shutdown: {e}")
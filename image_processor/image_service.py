@@ -9,6 +9,7 @@ from image_processor.html_generator_service import HtmlGeneratorService
 from image_processor.utils import render_html_to_image, render_html_to_image_wkhtml
 from utils.feature_flags import flags
 from utils.logger import setup_logger
+from utils.metrics import timed
 
 load_dotenv()
 
@@ -30,31 +31,37 @@ def process_goal_events(events):
     return result
 
 
-def generate_goal_image(data: dict[str, Any]) -> None:
+def generate_goal_image(data: dict[str, Any]) -> list[str]:
     player = data.get("player_name")
     logger.info(f"Generating goal image for {player}")
     save_to_disk = flags.save_html_to_disk
     html_generator = HtmlGeneratorService()
-    html = html_generator.generate_goal_html(data, save_to_disk)
+    with timed("html_goal"):
+        html = html_generator.generate_goal_html(data, save_to_disk)
     timestamp = time.strftime("%Y%m%d-%H%M%S")
     filename_1 = f"goal_{player}_{timestamp}_wkhtml.png"
     filename_2 = f"goal_{player}_{timestamp}_playwright.jpg"
-    render_html_to_image_wkhtml(html, filename_1)
-    render_html_to_image(html, filename_2)
+    return [
+        render_html_to_image_wkhtml(html, filename_1),
+        render_html_to_image(html, filename_2),
+    ]
 
 
-def generate_cards_image(data: dict[str, Any]) -> None:
+def generate_cards_image(data: dict[str, Any]) -> list[str]:
     player = data.get("player_name")
     logger.info(f"Generating cards image for {player}")
     save_to_disk = flags.save_html_to_disk
     html_generator = HtmlGeneratorService()
-    html = html_generator.generate_cards_html(data, save_to_disk)
+    with timed("html_card"):
+        html = html_generator.generate_cards_html(data, save_to_disk)
     color = data.get("card_color")
     timestamp = time.strftime("%Y%m%d-%H%M%S")
     filename_1 = f"card_{color}_{player}_{timestamp}_wkhtml.png"
     filename_2 = f"card_{color}_{player}_{timestamp}_playwright.png"
-    render_html_to_image_wkhtml(html, filename_1)
-    render_html_to_image(html, filename_2)
+    return [
+        render_html_to_image_wkhtml(html, filename_1),
+        render_html_to_image(html, filename_2),
+    ]
 
 
 # def generate_game_status_html(data):
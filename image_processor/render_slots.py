@@ -0,0 +1,179 @@
+import fcntl
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from utils.logger import setup_logger
+from utils.metrics import RENDER_QUEUE_DEPTH, RENDERS_IN_FLIGHT
+
+load_dotenv()
+
+logger = setup_logger("render_slots")
+
+# Chromium rendering a 1920x1920 page peaks around this much
+RENDER_MEMORY_MB = int(os.getenv("RENDER_MEMORY_MB", "512"))
+# 0 derives it from the cores and memory of the host or container
+RENDER_CONCURRENCY = int(os.getenv("RENDER_CONCURRENCY", "0"))
+# Renders allowed to wait for a slot; goals always queue
+RENDER_MAX_QUEUE = int(os.getenv("RENDER_MAX_QUEUE", "0"))
+# Card images of events older than this are no longer worth posting
+RENDER_STALE_SECONDS = float(os.getenv("RENDER_STALE_SECONDS", "120"))
+RENDER_SLOTS_DIR = os.getenv(
+    "RENDER_SLOTS_DIR", "/tmp/football_mad_render_slots"  # nosec B108
+)
+POLL_INTERVAL = 0.05
+
+_waiter_ids = itertools.count()
+
+
+class RenderShed(Exception):
+    """A render was dropped because the worker is saturated."""
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def available_cpus() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    # cgroup v2 quota of the container, e.g. "200000 100000" for 2 cores
+    quota = (_read("/sys/fs/cgroup/cpu.max") or "max").split()
+    if len(quota) == 2 and quota[0] != "max":
+        cpus = min(cpus, max(1, int(int(quota[0]) / int(quota[1]))))
+    return max(1, cpus)
+
+
+def available_memory_mb() -> Optional[int]:
+    """Memory available now, capped by the container limit (cgroup v2 or v1)."""
+    limits = []
+    for path in (
+        "/sys/fs/cgroup/memory.max",
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+    ):
+        value = (_read(path) or "").strip()
+        if value.isdigit():
+            limits.append(int(value) // 2**20)
+    for line in (_read("/proc/meminfo") or "").splitlines():
+        if line.startswith("MemAvailable:"):
+            limits.append(int(line.split()[1]) // 1024)
+    return min(limits) if limits else None
+
+
+def default_render_concurrency() -> int:
+    if RENDER_CONCURRENCY > 0:
+        return RENDER_CONCURRENCY
+    slots = available_cpus()
+    memory_mb = available_memory_mb()
+    if memory_mb is not None:
+        slots = min(slots, memory_mb // RENDER_MEMORY_MB)
+    return max(1, slots)
+
+
+class RenderSlots:
+    """
+    Counting semaphore over ``flock``-ed slot files, shared by every process
+    (prefork children, other workers of the container) that sees ``path``.
+    Waiting renders are counted through waiter files, locked before they are
+    named, so the queue stays bounded; a crashed process releases both with
+    its file descriptors.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        max_queue: int,
+        path: str = RENDER_SLOTS_DIR,
+    ):
+        self.slots = slots
+        self.max_queue = max_queue
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _try_slot(self):
+        for slot in range(self.slots):
+            f = open(self.path / f"slot-{slot}.lock", "a")
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return f
+            except BlockingIOError:
+                f.close()
+        return None
+
+    def queue_depth(self) -> int:
+        """Renders currently waiting for a slot."""
+        waiting = 0
+        for waiter in self.path.glob("wait-*.lock"):
+            try:
+                with open(waiter, "a") as f:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                # Nobody holds it: left behind by a process that died
+                waiter.unlink(missing_ok=True)
+            except BlockingIOError:
+                waiting += 1
+            except FileNotFoundError:
+                pass
+        return waiting
+
+    @contextmanager
+    def _waiting(self):
+        name = f"wait-{os.getpid()}-{threading.get_ident()}-{next(_waiter_ids)}.lock"
+        # Locked before it shows up under its wait-* name, so queue_depth never
+        # mistakes a waiter that just opened its file for one that died
+        staging = self.path / f".{name}"
+        f = open(staging, "a")
+        fcntl.flock(f, fcntl.LOCK_EX)
+        waiter = self.path / name
+        os.rename(staging, waiter)
+        RENDER_QUEUE_DEPTH.inc()
+        try:
+            yield
+        finally:
+            RENDER_QUEUE_DEPTH.dec()
+            waiter.unlink(missing_ok=True)
+            f.close()
+
+    @contextmanager
+    def slot(self, protected: bool = False):
+        """
+        Hold a render slot for the block, waiting for one if all are taken.
+
+        :param protected: Never shed (goals); otherwise raise ``RenderShed``
+            when ``max_queue`` renders are already waiting
+        :raises RenderShed: The render should be dropped
+        """
+        f = self._try_slot()
+        if f is None:
+            if not protected and self.queue_depth() >= self.max_queue:
+                raise RenderShed(f"{self.max_queue} renders already waiting")
+            with self._waiting():
+                while f is None:
+                    time.sleep(POLL_INTERVAL)
+                    f = self._try_slot()
+        RENDERS_IN_FLIGHT.inc()
+        try:
+            yield
+        finally:
+            RENDERS_IN_FLIGHT.dec()
+            fcntl.flock(f, fcntl.LOCK_UN)
+            f.close()
+
+
+def render_slots() -> RenderSlots:
+    """Build the worker's render slots from the RENDER_* settings."""
+    slots = default_render_concurrency()
+    max_queue = RENDER_MAX_QUEUE or 2 * slots
+    logger.info(f"🖼️ {slots} render slots, up to {max_queue} waiting")
+    return RenderSlots(slots, max_queue)
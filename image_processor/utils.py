@@ -1,4 +1,12 @@
 # utils.py
+import threading
+from contextlib import contextmanager
+
+from utils.metrics import timed
+
+_session = threading.local()
+
+
 def generate_css_goal_and_cards(template_url: str) -> str:
     return f"""
     html, body {{
@@ -207,6 +215,27 @@ def prepare_html_output(
     return str(html_path), str(image_path)
 
 
+@contextmanager
+def render_session():
+    """
+    Share one Chromium instance between the Playwright renders inside the
+    block instead of launching one per image. Nested sessions reuse the outer one.
+    """
+    if getattr(_session, "browser", None) is not None:
+        yield
+        return
+
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        _session.browser = p.chromium.launch()
+        try:
+            yield
+        finally:
+            _session.browser.close()
+            _session.browser = None
+
+
 def render_html_to_image(
     html: str,
     output_filename: str = "rendered.png",
@@ -220,13 +249,21 @@ def render_html_to_image(
     print("🖼️ Rendering HTML to image using Playwright...")
     html_path, output_image_path = prepare_html_output(html, output_filename)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
+    def screenshot(browser):
         page = browser.new_page()
         page.goto(f"file://{html_path}")
         page.set_viewport_size({"width": width, "height": height})
         page.screenshot(path=str(output_image_path))
-        browser.close()
+        page.close()
+
+    with timed("render_playwright"):
+        if getattr(_session, "browser", None) is not None:
+            screenshot(_session.browser)
+        else:
+            with sync_playwright() as p:
+                browser = p.chromium.launch()
+                screenshot(browser)
+                browser.close()
 
     print(f"✅ Screenshot saved to {output_image_path}")
     return str(output_image_path)
@@ -242,7 +279,8 @@ def render_html_to_image_wkhtml(
     html_path, output_image_path = prepare_html_output(html, output_filename)
 
     command = ["wkhtmltoimage", html_path, str(output_image_path)]
-    result = subprocess.run(command, capture_output=True, text=True)
+    with timed("render_wkhtml"):
+        result = subprocess.run(command, capture_output=True, text=True)
 
     if result.returncode != 0:
         raise RuntimeError(f"wkhtmltoimage failed:\n{result.stderr}")
@@ -21,7 +21,14 @@ class PerformFeedsService:
     def __init__(self, outlet: str = None, secret: str = None):
         self.outlet = outlet or OUTLET
         self.secret = secret or SECRET
-        self.access_token = self._authenticate()
+        self._access_token = None
+
+    @property
+    def access_token(self) -> str:
+        # Authenticate on first use so building the service stays offline
+        if self._access_token is None:
+            self._access_token = self._authenticate()
+        return self._access_token
 
     def _generate_unique_hash(self, timestamp: int) -> str:
         key = str.encode(self.outlet + str(timestamp) + self.secret)
@@ -5,8 +5,14 @@ import re
 from celery import Celery
 from dotenv import load_dotenv
 
+from celery_worker.batching import MessageBatcher
+from celery_worker.routing import configure_routing
+from utils.feature_flags import flags
+
 load_dotenv()
 app = Celery("producer", broker=os.getenv("BROKER_URL_LOCALHOST"))
+# Goals and cards are routed to the high priority queue here already
+configure_routing(app)
 
 # Path to your test data log file
 TEST_DATA_FILE = "test_data"
@@ -15,7 +21,8 @@ TEST_DATA_FILE = "test_data"
 JSON_PATTERN = re.compile(r"Parsed message: (?P<json>{.*})")
 
 
-def produce_tasks_from_file(filepath: str):
+def produce_tasks_from_file(filepath: str, batch: bool = False):
+    batcher = MessageBatcher(app) if batch else None
     with open(filepath, encoding="utf-8") as file:
         for line_number, line in enumerate(file, start=1):
             match = JSON_PATTERN.search(line)
@@ -33,15 +40,20 @@ def produce_tasks_from_file(filepath: str):
                     continue
 
                 # Send task to Celery
-                app.send_task(
-                    "process_match_event", args=[{"matchDetails": match_details}]
-                )
+                if batcher:
+                    batcher.add({"matchDetails": match_details})
+                else:
+                    app.send_task(
+                        "process_match_event", args=[{"matchDetails": match_details}]
+                    )
                 print(
                     f"📨 Sent task for match ID {match_details.get('id')} (line {line_number})"
                 )
 
             except json.JSONDecodeError as e:
                 print(f"❌ JSON error on line {line_number}: {e}")
+    if batcher:
+        batcher.flush()
 
 
 if __name__ == "__main__":
@@ -53,4 +65,4 @@ if __name__ == "__main__":
     }
     # app.send_task("process_match_event", args=[event])
     # print("📨 Task sent!")
-    produce_tasks_from_file(TEST_DATA_FILE)
+    produce_tasks_from_file(TEST_DATA_FILE, batch=flags.batch_tasks)
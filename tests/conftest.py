@@ -0,0 +1,105 @@
+import contextlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("DIRECTUS_BASE_URL", "http://directus.test")
+os.environ.setdefault("BROKER_URL", "memory://")
+# Loggers write their files here instead of into the repository's logs/
+os.environ.setdefault("LOGS_DIR", tempfile.mkdtemp(prefix="football-mad-logs-"))
+
+TEST_DATA = Path(__file__).resolve().parent.parent / "test_data"
+
+ARSENAL = "4dsgumo7d4zupm2ugsvm4zm4d"
+CRYSTAL_PALACE = "1c8m2ko0wxq1asfkuykurdr0y"
+
+
+def load_messages() -> list[dict]:
+    """The liveData messages of the recorded match in ``test_data``."""
+    messages = []
+    for line in TEST_DATA.read_text(encoding="utf-8").splitlines():
+        if "Parsed message: " in line:
+            parsed = json.loads(line.split("Parsed message: ", 1)[1])
+            messages.append(parsed["content"]["liveData"])
+    return messages
+
+
+def fake_get_items(params):
+    """Directus answers for the fixture of ``test_data``."""
+    if params.entity in ("opta_event_types", "opta_event_qualifiers"):
+        if params.offset:
+            return []
+        return [
+            {"opta_id": i, "name": f"{params.entity} {i}"}
+            for i in (13, 16, 17, 31, 33, 55, 393)
+        ]
+    if params.entity == "teams":
+        return [
+            {
+                "id": 1,
+                "name": "Arsenal",
+                "goal_template": "goal.png",
+                "card_template": "card.png",
+                "integration": {"opta_id": ARSENAL},
+            },
+            {
+                "id": 2,
+                "name": "Crystal Palace",
+                "goal_template": "goal.png",
+                "card_template": "card.png",
+                "integration": {"opta_id": CRYSTAL_PALACE},
+            },
+        ]
+    if params.entity == "players":
+        opta_ids = (
+            (params.filter.get("integration") or {}).get("opta_id", {}).get("_in", [])
+        )
+        return [
+            {
+                "name": f"Player {opta_id}",
+                "photo": "player.png",
+                "integration": {"opta_id": opta_id},
+            }
+            for opta_id in opta_ids
+        ]
+    return []
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Renders requested by the service, as (kind, params); nothing is drawn."""
+    import celery_worker.match_event_service as service_module
+
+    calls = []
+    for kind in ("goal", "card"):
+        monkeypatch.setitem(
+            service_module.RENDERERS,
+            kind,
+            lambda params, kind=kind: calls.append((kind, params))
+            or [f"/images/{kind}.png"],
+        )
+    monkeypatch.setattr(service_module, "render_session", contextlib.nullcontext)
+    return calls
+
+
+@pytest.fixture
+def make_service(monkeypatch, tmp_path):
+    """Build a MatchEventService with fake Directus data and local state."""
+    from celery_worker.dedup_store import SQLiteDedupStore
+    from celery_worker.match_event_service import MatchEventService
+
+    monkeypatch.setenv("SAVE_TO_GSHEET", "false")
+
+    def make(**env):
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        service = MatchEventService("sheet-id")
+        service.directus.get_items = fake_get_items
+        if service.dedup is not None:
+            service.dedup = SQLiteDedupStore(path=str(tmp_path / "dedup.sqlite"))
+        return service
+
+    return make
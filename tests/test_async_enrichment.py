@@ -0,0 +1,31 @@
+import asyncio
+import threading
+
+
+def test_threads_get_their_own_event_loop(make_service):
+    service = make_service()
+    barrier = threading.Barrier(4)
+    states, errors = [], []
+
+    def run():
+        try:
+            loop = service._get_event_loop()
+            states.append((loop, service.async_directus))
+            barrier.wait(timeout=5)
+            # All four threads run their loop at the same time
+            loop.run_until_complete(asyncio.sleep(0.05))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len({id(loop) for loop, _ in states}) == 4
+    assert len({id(client) for _, client in states}) == 4
+    # The thread keeps its loop and client across tasks
+    assert service._get_event_loop() is service._get_event_loop()
+    service.close()
@@ -0,0 +1,104 @@
+import contextlib
+
+import celery_worker.match_event_service as service_module
+from celery_worker.match_event_service import MatchEventService
+from tests.conftest import load_messages
+
+
+def opta_event(event_id, last_modified, seq_id):
+    return {"id": event_id, "lastModified": last_modified, "seqId": seq_id}
+
+
+def test_coalesce_keeps_the_latest_version_in_seq_order():
+    raw_events = [
+        opta_event(2, "2025-04-23T19:03:25", 9),
+        opta_event(1, "2025-04-23T19:02:44", 7),
+        opta_event(2, "2025-04-23T19:02:00", 8),
+        {"typeId": 1},
+        opta_event(3, "2025-04-23T19:04:51", 5),
+    ]
+
+    assert MatchEventService._coalesce_events(raw_events) == [
+        # Events without an id cannot be coalesced and are kept as they are
+        {"typeId": 1},
+        opta_event(3, "2025-04-23T19:04:51", 5),
+        opta_event(1, "2025-04-23T19:02:44", 7),
+        opta_event(2, "2025-04-23T19:03:25", 9),
+    ]
+
+
+def test_coalesce_prefers_the_later_seq_id_of_one_version():
+    raw_events = [
+        opta_event(1, "2025-04-23T19:02:44", 8),
+        opta_event(1, "2025-04-23T19:02:44", 7),
+    ]
+    assert MatchEventService._coalesce_events(raw_events) == [raw_events[0]]
+
+
+def test_batched_lookups_are_timed_per_feed(make_service, rendered, monkeypatch):
+    stages = []
+
+    @contextlib.contextmanager
+    def timed(stage, feed_name="", type_id=""):
+        stages.append((stage, feed_name))
+        yield
+
+    monkeypatch.setattr(service_module, "timed", timed)
+    make_service(USE_EVENT_DEDUP="false").enrich_batch(load_messages())
+
+    lookups = [feed_name for stage, feed_name in stages if stage == "directus_lookup"]
+    # One lookup per fixture and feed of test_data
+    assert sorted(lookups) == ["liveScore"] * 2 + ["matchEvent"] * 2
+
+
+def feed_message(feed_name, *raw_events, fixture_id="fixture-1"):
+    return {
+        "matchDetails": {
+            "id": fixture_id,
+            "feedName": feed_name,
+            "event": list(raw_events),
+        }
+    }
+
+
+def test_drop_superseded_keeps_the_newest_copy_per_feed():
+    old = feed_message("liveScore", opta_event(1, "2025-04-23T19:02:44", 7))
+    new = feed_message("liveScore", opta_event(1, "2025-04-23T19:03:25", 9))
+    # The same version from another feed is its own event
+    other_feed = feed_message("matchEvent", opta_event(1, "2025-04-23T19:02:44", 62))
+
+    assert MatchEventService._drop_superseded([old, new, other_feed]) == [
+        new,
+        other_feed,
+    ]
+    # Whatever order they arrived in
+    assert MatchEventService._drop_superseded([new, old]) == [new]
+
+
+def test_drop_superseded_trims_messages_with_newer_events_elsewhere():
+    first = feed_message(
+        "liveScore",
+        opta_event(1, "2025-04-23T19:02:44", 7),
+        opta_event(2, "2025-04-23T19:02:50", 8),
+    )
+    second = feed_message("liveScore", opta_event(1, "2025-04-23T19:03:25", 9))
+
+    trimmed, kept = MatchEventService._drop_superseded([first, second])
+
+    assert trimmed["matchDetails"]["event"] == [opta_event(2, "2025-04-23T19:02:50", 8)]
+    # The message is copied, the one given is left as it was
+    assert len(first["matchDetails"]["event"]) == 2
+    assert kept == second
+
+
+def test_batch_renders_each_event_once(make_service, rendered):
+    service = make_service(USE_EVENT_DEDUP="false")
+    messages = load_messages()
+    # Three versions of one goal from the feed that renders images
+    goals = [messages[13], messages[11], messages[15]]
+
+    payload = service.enrich_batch(goals)
+    service.render(payload)
+
+    assert [kind for kind, _ in rendered] == ["goal"]
+    assert [d["opta_id"] for d in payload["details"]] == [2805265711]
@@ -0,0 +1,52 @@
+import httpx
+import pytest
+
+from directus.directus_service import (
+    HTTP_MAX_RETRY_DELAY,
+    DirectusService,
+    InFlightRequests,
+    retry_delay,
+)
+
+
+def test_retry_after_is_honoured():
+    response = httpx.Response(429, headers={"Retry-After": "2"})
+    assert retry_delay(0, response) == 2
+
+
+def test_retry_after_is_capped():
+    response = httpx.Response(503, headers={"Retry-After": "3600"})
+    assert retry_delay(0, response) == HTTP_MAX_RETRY_DELAY
+
+
+def lookups_saved(entity: str, reason: str) -> float:
+    prometheus_client = pytest.importorskip("prometheus_client")
+    return (
+        prometheus_client.REGISTRY.get_sample_value(
+            "directus_lookups_saved_total", {"entity": entity, "reason": reason}
+        )
+        or 0
+    )
+
+
+def test_coalesced_lookups_are_counted():
+    in_flight = InFlightRequests()
+    before = lookups_saved("players", "coalesced")
+
+    in_flight.claim("players", ["p1", "p2"])
+    own, waiting = in_flight.claim("players", ["p1", "p2", "p3"])
+
+    assert own == ["p3"] and len(waiting) == 2
+    assert in_flight.coalesced == 2
+    assert lookups_saved("players", "coalesced") - before == 2
+
+
+def test_negative_hits_are_counted():
+    service = DirectusService()
+    service._cache_results("players", ["p1"], {})
+    before = lookups_saved("players", "negative_hit")
+
+    assert service._cache_get_many("players", ["p1"]) == ({}, [])
+
+    assert service.cache_stats()["negative_hits"] == 1
+    assert lookups_saved("players", "negative_hit") - before == 1
@@ -0,0 +1,78 @@
+from collections import Counter
+
+import pytest
+
+from celery_worker.dedup_store import SQLiteDedupStore
+from tests.conftest import load_messages
+
+
+def replay(service) -> list:
+    for message in load_messages():
+        service.process_event(message)
+
+
+def images(rendered) -> set:
+    return {(kind, params.get("player_name")) for kind, params in rendered}
+
+
+def test_dedup_keeps_images_of_every_feed(make_service, rendered):
+    # matchEvent and liveScore carry the same event ids and lastModified, and
+    # only liveScore renders images
+    replay(make_service(USE_EVENT_DEDUP="false"))
+    without_dedup = images(rendered)
+    rendered.clear()
+
+    replay(make_service(USE_EVENT_DEDUP="true"))
+
+    # Each image of test_data once (2 goals, 2 cards) instead of 10 renders
+    assert Counter(kind for kind, _ in rendered) == {"goal": 2, "card": 2}
+    assert images(rendered) == without_dedup
+
+
+def test_dedup_skips_repeats_of_the_same_feed(make_service, rendered):
+    service = make_service(USE_EVENT_DEDUP="true")
+    messages = load_messages()
+    for message in messages:
+        service.process_event(message)
+    rendered.clear()
+
+    for message in messages:
+        assert service.process_event(message)["processed"] == 0
+    assert rendered == []
+
+
+def test_claims_are_per_feed(tmp_path):
+    store = SQLiteDedupStore(path=str(tmp_path / "dedup.sqlite"))
+    assert store.claim_event(1, "matchEvent:10", "2025-04-23T19:46:58")
+    assert store.claim_event(1, "liveScore:10", "2025-04-23T19:46:58")
+    assert not store.claim_event(1, "liveScore:10", "2025-04-23T19:46:58")
+
+
+def test_claims_are_released_when_persist_fails(make_service, rendered):
+    service = make_service(USE_EVENT_DEDUP="true")
+    message = load_messages()[0]
+
+    def fail(payload):
+        raise RuntimeError("429 Quota exceeded")
+
+    service.persist = fail
+    with pytest.raises(RuntimeError):
+        service.process_event(message)
+    del service.persist
+
+    # A resent copy is processed instead of skipped as a repeat
+    assert service.process_event(message)["processed"] > 0
+
+
+def test_release_in_another_process_is_seen(tmp_path):
+    # enrich claims in one worker, render or persist releases in another
+    path = str(tmp_path / "dedup.sqlite")
+    enrich = SQLiteDedupStore(path=path)
+    persist = SQLiteDedupStore(path=path)
+    assert enrich.claim_event(1, "liveScore:10", "2025-04-23T19:46:58")
+
+    persist.release_event(1, "liveScore:10")
+
+    assert enrich.claim_event(1, "liveScore:10", "2025-04-23T19:46:58")
+    assert not enrich.claim_event(1, "liveScore:10", "2025-04-23T19:46:58")
+    assert not enrich.claim_event(1, "liveScore:10", "2025-04-23T19:40:00")
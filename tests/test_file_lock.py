@@ -0,0 +1,47 @@
+import os
+import signal
+import time
+
+from utils.file_lock import locked_file
+
+
+def fork(child) -> int:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            child()
+        finally:
+            os._exit(0)
+    return pid
+
+
+def stop(pid: int) -> None:
+    os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+
+
+def test_lock_excludes_other_processes(tmp_path):
+    path = str(tmp_path / "lock")
+    ready_r, ready_w = os.pipe()
+
+    def hold():
+        with locked_file(path):
+            os.write(ready_w, b"1")
+            time.sleep(30)
+
+    pid = fork(hold)
+    try:
+        os.read(ready_r, 1)
+        with locked_file(path, blocking=False) as f:
+            assert f is None
+    finally:
+        stop(pid)
+    with locked_file(path, blocking=False) as f:
+        assert f is not None
+
+
+def test_lock_excludes_other_threads(tmp_path):
+    path = str(tmp_path / "lock")
+    with locked_file(path):
+        with locked_file(path, blocking=False) as f:
+            assert f is None
@@ -0,0 +1,39 @@
+import threading
+
+from celery_worker.fixture_roster import FixtureRosters
+
+
+class SlowDirectus:
+    """Teams of fixture "slow" are only answered once ``release`` is set."""
+
+    def __init__(self):
+        self.waiting = threading.Event()
+        self.release = threading.Event()
+
+    def get_teams_by_opta_ids(self, opta_ids):
+        if "slow-team" in opta_ids:
+            self.waiting.set()
+            self.release.wait(timeout=10)
+        return {i: {"id": i, "name": i} for i in opta_ids}
+
+    def get_players_by_team(self, team_id):
+        return {f"{team_id}-player": {"name": "Player"}}
+
+
+def test_loading_one_fixture_does_not_block_others():
+    directus = SlowDirectus()
+    rosters = FixtureRosters(directus)
+    slow = threading.Thread(target=rosters.ensure_teams, args=("slow", ["slow-team"]))
+    fast = threading.Thread(target=rosters.ensure_teams, args=("fast", ["fast-team"]))
+    slow.start()
+    try:
+        assert directus.waiting.wait(timeout=5)
+        fast.start()
+        fast.join(timeout=2)
+        assert not fast.is_alive()
+    finally:
+        directus.release.set()
+        slow.join()
+        fast.join()
+    assert rosters.ensure_teams("fast", []).get_player("fast-team-player")
+    assert rosters.ensure_teams("slow", []).get_team("slow-team")
@@ -0,0 +1,49 @@
+import pytest
+
+from celery_worker import tasks
+from tests.conftest import load_messages
+
+
+class RecordingSink:
+    """Stands in for the event sinks; keeps the events written."""
+
+    def __init__(self):
+        self.sinks = [self]
+        self.written = []
+
+    def write_events(self, events, tab_name=None):
+        self.written.extend(events)
+
+
+@pytest.fixture
+def eager_service(make_service, monkeypatch):
+    """Run the staged pipeline in-process with the service of ``make_service``."""
+    monkeypatch.setitem(tasks.app.conf, "task_always_eager", True)
+    monkeypatch.setitem(tasks.app.conf, "task_eager_propagates", True)
+    service = make_service(USE_STAGED_PIPELINE="true", USE_EVENT_DEDUP="false")
+    service.event_sink = RecordingSink()
+    monkeypatch.setattr(tasks, "get_match_service", lambda: service)
+    return service
+
+
+def test_pipeline_enriches_renders_and_persists(eager_service, rendered):
+    goal = load_messages()[11]
+
+    result = tasks.process_match_event.delay(goal).get()
+
+    assert result["status"] == "queued"
+    assert [kind for kind, _ in rendered] == ["goal"]
+    (persisted,) = eager_service.event_sink.written
+    assert persisted["opta_id"] == 2805265711
+    assert persisted["renders"][0]["paths"] == ["/images/goal.png"]
+
+
+def test_batch_pipeline_runs_one_pass(eager_service, rendered):
+    messages = load_messages()
+    # Two versions of one card, the older is dropped as superseded
+    cards = [messages[3], messages[5]]
+
+    tasks.process_match_events_batch.delay(cards).get()
+
+    assert [kind for kind, _ in rendered] == ["card"]
+    assert len(eager_service.event_sink.written) == 1
@@ -0,0 +1,19 @@
+import pytest
+
+from utils.rate_limiter import FileTokenBucket
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    return FileTokenBucket(rate=1, capacity=3, path=str(tmp_path / "bucket"))
+
+
+def test_burst_then_wait(bucket):
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() > 0
+    assert not bucket.acquire(timeout=0)
+
+
+def test_acquire_more_than_capacity_raises(bucket):
+    with pytest.raises(ValueError):
+        bucket.acquire(4, timeout=0)
@@ -0,0 +1,54 @@
+import pytest
+import redis
+
+from directus.redis_cache import RedisDirectusCache
+
+# Not in requirements.txt: these tests only run where it is installed
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def cache():
+    return RedisDirectusCache(client=fakeredis.FakeRedis())
+
+
+class BrokenRedis(fakeredis.FakeRedis):
+    def execute_command(self, *args, **kwargs):
+        raise redis.ConnectionError("Connection refused")
+
+
+def test_round_trip(cache):
+    cache.set_many("players", {"p1": {"name": "Saka"}, "p2": {"name": "Rice"}})
+
+    assert cache.get_many("players", ["p1", "p2", "p3"]) == {
+        "p1": {"name": "Saka"},
+        "p2": {"name": "Rice"},
+    }
+
+
+def test_keys_are_versioned(cache):
+    cache.set_many("players", {"p1": {"name": "Saka"}})
+    newer = RedisDirectusCache(client=cache.client, version=cache.version + 1)
+
+    assert newer.get_many("players", ["p1"]) == {}
+
+
+def test_invalidate(cache):
+    cache.set_many("players", {"p1": {"name": "Saka"}, "p2": {"name": "Rice"}})
+    cache.set_many("teams", {"t1": {"name": "Arsenal"}})
+
+    assert cache.invalidate("players", "p1") == 1
+    assert cache.get_many("players", ["p1", "p2"]) == {"p2": {"name": "Rice"}}
+    assert cache.invalidate("players") == 1
+    assert cache.get_many("teams", ["t1"]) == {"t1": {"name": "Arsenal"}}
+    assert cache.invalidate() == 1
+    assert cache.get_many("teams", ["t1"]) == {}
+
+
+def test_redis_errors_are_cache_misses():
+    cache = RedisDirectusCache(client=BrokenRedis())
+
+    cache.set_many("players", {"p1": {"name": "Saka"}})
+    assert cache.get_many("players", ["p1"]) == {}
+    assert cache.invalidate("players", "p1") == 0
+    assert cache.invalidate() == 0
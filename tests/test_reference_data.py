@@ -0,0 +1,31 @@
+import os
+import threading
+
+from directus.reference_data import ReferenceData
+
+
+def test_child_forked_during_a_load_can_load(monkeypatch):
+    reference_data = ReferenceData(directus=None, refresh_interval=0)
+    loading, forked = threading.Event(), threading.Event()
+
+    def fetch_index(entity):
+        loading.set()
+        forked.wait(5)
+        return {}
+
+    monkeypatch.setattr(reference_data, "_fetch_index", fetch_index)
+    # Stands in for the refresh thread of the worker's main process
+    thread = threading.Thread(target=reference_data.load)
+    thread.start()
+    loading.wait(5)
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        acquired = reference_data._load_lock.acquire(timeout=2)
+        os.write(write_fd, b"1" if acquired else b"0")
+        os._exit(0)
+    forked.set()
+    thread.join()
+    os.waitpid(pid, 0)
+    assert os.read(read_fd, 1) == b"1"
@@ -0,0 +1,39 @@
+import contextlib
+
+from celery_worker.match_event_service import message_events
+from tests.conftest import load_messages
+
+
+def goal_message() -> dict:
+    return next(
+        message
+        for message in load_messages()
+        if message["matchDetails"].get("feedName") == "liveScore"
+        and any(e.get("typeId") == 16 for e in message_events(message)[1])
+    )
+
+
+def test_browser_launch_error_still_persists(make_service, rendered, monkeypatch):
+    import celery_worker.match_event_service as service_module
+
+    @contextlib.contextmanager
+    def broken_session():
+        raise RuntimeError("Executable doesn't exist")
+        yield
+
+    monkeypatch.setattr(service_module, "render_session", broken_session)
+    service = make_service()
+    persisted = []
+
+    def persist(payload):
+        persisted.append(payload)
+        return payload
+
+    monkeypatch.setattr(service, "persist", persist)
+
+    service.process_event(goal_message())
+
+    assert rendered == []
+    (payload,) = persisted
+    jobs = service.failed_renders(payload)
+    assert jobs and all("Executable" in job["error"] for job in jobs)
@@ -0,0 +1,48 @@
+import fcntl
+
+import pytest
+
+import image_processor.render_slots as render_slots_module
+from image_processor.render_slots import RenderShed, RenderSlots
+
+
+@pytest.fixture
+def slots(tmp_path):
+    return RenderSlots(slots=1, max_queue=1, path=str(tmp_path))
+
+
+def test_waiters_are_counted(slots):
+    with slots._waiting():
+        assert slots.queue_depth() == 1
+    assert slots.queue_depth() == 0
+
+
+def test_files_of_dead_waiters_are_removed(slots):
+    (slots.path / "wait-1-1-0.lock").touch()
+
+    assert slots.queue_depth() == 0
+    assert not list(slots.path.glob("wait-*"))
+
+
+def test_new_waiter_is_not_taken_for_a_dead_one(slots, monkeypatch):
+    # queue_depth runs between the waiter creating its file and locking it
+    flock = fcntl.flock
+    racing = []
+
+    def racy_flock(f, operation):
+        if operation == fcntl.LOCK_EX and not racing:
+            racing.append(True)
+            slots.queue_depth()
+        return flock(f, operation)
+
+    monkeypatch.setattr(render_slots_module.fcntl, "flock", racy_flock)
+    with slots._waiting():
+        monkeypatch.setattr(render_slots_module.fcntl, "flock", flock)
+        assert slots.queue_depth() == 1
+
+
+def test_full_queue_sheds_unprotected_renders(slots):
+    with slots.slot(), slots._waiting():
+        with pytest.raises(RenderShed):
+            with slots.slot():
+                pass
@@ -0,0 +1,105 @@
+import pytest
+
+from celery_worker import routing
+from celery_worker.routing import (
+    CARD_PRIORITY,
+    DEFAULT_QUEUE,
+    ENRICH_QUEUE,
+    GOAL_PRIORITY,
+    HIGH_PRIORITY_QUEUE,
+    PERSIST_QUEUE,
+    RENDER_QUEUE,
+    fixture_shard,
+    jump_hash,
+    route_match_event,
+    shard_queue,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_shards(monkeypatch):
+    monkeypatch.setattr(routing, "FIXTURE_SHARDS", 0)
+
+
+def message(*events, fixture_id="fixture-1"):
+    return {"matchDetails": {"id": fixture_id, "event": list(events)}}
+
+
+GOAL = {"id": 1, "typeId": 16}
+YELLOW_CARD = {"id": 2, "typeId": 17, "qualifier": [{"qualifierId": 31}]}
+PASS = {"id": 3, "typeId": 1}
+
+
+def route(name, *args):
+    return route_match_event(name, args, {}, {})
+
+
+def test_goals_and_cards_go_to_the_high_priority_queue():
+    assert route("process_match_event", message(PASS, GOAL)) == {
+        "queue": HIGH_PRIORITY_QUEUE,
+        "priority": GOAL_PRIORITY,
+    }
+    assert route("enrich_match_event", message(YELLOW_CARD)) == {
+        "queue": HIGH_PRIORITY_QUEUE,
+        "priority": CARD_PRIORITY,
+    }
+    # A batch takes the priority of its highest message
+    assert route("process_match_events_batch", [message(PASS), message(GOAL)]) == {
+        "queue": HIGH_PRIORITY_QUEUE,
+        "priority": GOAL_PRIORITY,
+    }
+
+
+def test_card_events_without_a_card_qualifier_are_not_prioritized():
+    assert route("enrich_match_event", message({"id": 4, "typeId": 17})) == {
+        "queue": ENRICH_QUEUE
+    }
+
+
+def test_later_stages_are_prioritized_by_their_renders():
+    goal_payload = {"details": [{"renders": [{"kind": "goal"}]}]}
+    card_payload = {"details": [{"renders": [{"kind": "card"}]}]}
+    assert route("render_match_event", goal_payload) == {
+        "queue": HIGH_PRIORITY_QUEUE,
+        "priority": GOAL_PRIORITY,
+    }
+    assert route("persist_match_event", card_payload) == {
+        "queue": HIGH_PRIORITY_QUEUE,
+        "priority": CARD_PRIORITY,
+    }
+    assert route("render_match_event", {"details": [{}]}) == {"queue": RENDER_QUEUE}
+    assert route("persist_match_event", {"details": []}) == {"queue": PERSIST_QUEUE}
+
+
+def test_other_tasks_keep_the_default_routing():
+    assert route("process_match_event", message(PASS)) == {"queue": DEFAULT_QUEUE}
+    assert route("some_other_task", message(GOAL)) is None
+
+
+def test_jump_hash_moves_few_keys_when_shards_grow():
+    keys = range(10_000)
+    for shards in (1, 2, 5, 8):
+        before = [jump_hash(key, shards) for key in keys]
+        after = [jump_hash(key, shards + 1) for key in keys]
+        moved = [(b, a) for b, a in zip(before, after) if b != a]
+        # Keys only ever move to the new shard, about 1/(shards + 1) of them
+        assert {a for _, a in moved} <= {shards}
+        assert abs(len(moved) / len(keys) - 1 / (shards + 1)) < 0.02
+        assert set(after) == set(range(shards + 1))
+
+
+def test_fixture_shard_is_stable():
+    # Producers and workers run in other processes, the shard must not depend
+    # on the salted hash() and must not change between releases
+    fixture_id = "do5ertwz5kefkxoyelso7xpg4"
+    assert [fixture_shard(fixture_id, n) for n in (1, 4, 16)] == [0, 1, 1]
+
+
+def test_other_events_of_a_fixture_go_to_its_shard(monkeypatch):
+    monkeypatch.setattr(routing, "FIXTURE_SHARDS", 4)
+    queue = shard_queue(fixture_shard("fixture-1", 4))
+    assert route("process_match_event", message(PASS)) == {"queue": queue}
+    assert route("process_match_events_batch", [message(PASS)]) == {"queue": queue}
+    # Priorities still win over the shard
+    assert route("enrich_match_event", message(GOAL))["queue"] == HIGH_PRIORITY_QUEUE
+    assert route("render_match_event", {"details": []}) == {"queue": RENDER_QUEUE}
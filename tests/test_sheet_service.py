@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from google.sheet_service import GoogleSheetService
+
+
+class FakeWorksheet:
+    """A tab as the Sheets API returns it: trailing empty cells are left out."""
+
+    col_count = 4
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    def get_all_values(self):
+        self.requests.append("all")
+        return [list(row) for row in self.rows]
+
+    def get(self, range_name):
+        self.requests.append(range_name)
+        first = int(range_name.split(":")[0][1:])
+        rows = [list(row) for row in self.rows[first - 1 :]]
+        for row in rows:
+            while row and row[-1] == "":
+                row.pop()
+        return rows
+
+
+class FakeSpreadsheet:
+    def __init__(self, worksheet):
+        self._worksheet = worksheet
+
+    def worksheet(self, tab_name):
+        return self._worksheet
+
+
+@pytest.fixture
+def tab():
+    return FakeWorksheet([["a", "b", "c", "d"], ["1", "2", "3", "4"]])
+
+
+@pytest.fixture
+def service(tab):
+    service = GoogleSheetService("sheet-id")
+    # Already authorized in this process
+    service._client, service._pid = object(), os.getpid()
+    service._sheet = FakeSpreadsheet(tab)
+    return service
+
+
+def test_first_read_fetches_the_whole_tab(service, tab):
+    assert service.get_new_rows("events") == tab.rows
+    assert tab.requests == ["all"]
+
+
+def test_later_reads_fetch_only_appended_rows(service, tab):
+    service.get_all_rows("events")
+    tab.rows.append(["5", "", "7", ""])
+
+    assert service.get_new_rows("events") == [["5", "", "7", ""]]
+    assert tab.requests == ["all", "A3:D"]
+    assert service.get_new_rows("events") == []
+    assert service.get_all_rows("events") == tab.rows
+    assert tab.requests == ["all", "A3:D", "A4:D", "A4:D"]
+
+
+def test_updated_rows_are_kept_in_the_cache(service, tab):
+    tab.batch_update = lambda updates: None
+    service.get_all_rows("events")
+
+    service.update_rows({2: ["1", None, 3, "4"]}, tab_name="events")
+
+    assert service.get_all_rows("events")[1] == ["1", "", "3", "4"]
+
+
+def test_refresh_reads_the_whole_tab_again(service, tab):
+    service.get_all_rows("events")
+    tab.rows[1] = ["edited", "", "", ""]
+
+    assert service.get_all_rows("events", refresh=True)[1] == ["edited", "", "", ""]
+    assert tab.requests == ["all", "all"]
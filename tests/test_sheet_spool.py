@@ -0,0 +1,88 @@
+import json
+import os
+import signal
+import time
+
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+from google.sheet_spool import SheetSpool, SpoolDrainer
+
+
+def api_error(status_code: int) -> APIError:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(
+        {"error": {"code": status_code, "message": "error", "status": "ERROR"}}
+    ).encode()
+    return APIError(response)
+
+
+class FailingSheet:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def append_rows(self, rows, tab_name=None):
+        raise self.error
+
+
+@pytest.fixture
+def spool(tmp_path):
+    spool = SheetSpool(path=str(tmp_path / "spool.sqlite"))
+    spool.put([["row", 1], ["row", 2]], tab_name="game events")
+    return spool
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        api_error(429),
+        api_error(503),
+        requests.ConnectionError("reset"),
+        RuntimeError("redis unavailable"),
+        FileNotFoundError("credentials.json"),
+    ],
+)
+def test_drain_keeps_rows_on_errors_that_may_pass(spool, error):
+    drainer = SpoolDrainer(spool, FailingSheet(error))
+
+    assert drainer.drain() == 0
+    assert spool.counts() == {"pending": 2, "failed": 0}
+    assert drainer.backoff() > drainer.interval
+
+
+def test_drain_fails_rows_sheets_rejects(spool):
+    drainer = SpoolDrainer(spool, FailingSheet(api_error(400)))
+
+    assert drainer.drain() == 0
+    assert spool.counts() == {"pending": 0, "failed": 2}
+
+
+class ForkingSheet:
+    """Forks a child (as a pool restarting a process would) while appending."""
+
+    def __init__(self):
+        self.children = []
+        self.appended = []
+
+    def append_rows(self, rows, tab_name=None):
+        pid = os.fork()
+        if pid == 0:
+            time.sleep(30)
+            os._exit(0)
+        self.children.append(pid)
+        self.appended.extend(rows)
+
+
+def test_child_forked_during_a_drain_does_not_block_the_next(spool):
+    sheet = ForkingSheet()
+    drainer = SpoolDrainer(spool, sheet)
+    try:
+        assert drainer.drain() == 2
+        spool.put([["row", 3]], tab_name="game events")
+        assert drainer.drain() == 1
+    finally:
+        for pid in sheet.children:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
@@ -0,0 +1,51 @@
+from google.sheet_upsert import SheetUpserter
+
+
+class FakeSheet:
+    """A tab holding one event row; appends land below it."""
+
+    def __init__(self):
+        self.rows = [["time", "player", "team", "type", "", "e1", "f1"]]
+        self.requests = []
+
+    def get_all_rows(self, tab_name=None, refresh=False):
+        self.requests.append("read")
+        return list(self.rows)
+
+    def update_rows(self, updates, tab_name=None):
+        self.requests.append("update")
+
+    def append_rows(self, rows, tab_name=None):
+        self.requests.append("append")
+        first = len(self.rows) + 1
+        self.rows.extend(rows)
+        return {"updates": {"updatedRange": f"'{tab_name}'!A{first}:M{first}"}}
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.tokens = 0
+
+    def acquire(self, tokens=1, timeout=None):
+        self.tokens += tokens
+        return True
+
+
+def row(opta_id):
+    return ["time", "player", "team", "type", "", opta_id, "f1"]
+
+
+def test_one_token_per_request():
+    sheet, limiter = FakeSheet(), CountingLimiter()
+    upserter = SheetUpserter(sheet, rate_limiter=limiter)
+
+    result = upserter.upsert_rows([row("e1"), row("e2")], tab_name="game events")
+
+    assert result == {"updated": 1, "appended": 1}
+    assert sheet.requests == ["read", "update", "append"]
+    assert limiter.tokens == 3
+
+    upserter.upsert_rows([row("e2")], tab_name="game events")
+
+    assert sheet.requests[3:] == ["update"]
+    assert limiter.tokens == 4
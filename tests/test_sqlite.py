@@ -0,0 +1,23 @@
+import os
+
+from utils.sqlite import SQLiteConnection
+
+
+def test_connection_is_reused_and_reopened_after_fork(tmp_path):
+    db = SQLiteConnection(
+        str(tmp_path / "db" / "test.sqlite"),
+        schema="CREATE TABLE IF NOT EXISTS t (x);",
+        synchronous="NORMAL",
+    )
+    conn = db.get()
+    assert db.get() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert conn.execute("PRAGMA synchronous").fetchone() == (1,)
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write_fd, b"1" if db.get() is not conn else b"0")
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert os.read(read_fd, 1) == b"1"
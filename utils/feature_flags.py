@@ -46,6 +46,62 @@ class FeatureFlags:
             == feed_name.lower()
         )
 
+    @property
+    def directus_http2(self) -> bool:
+        return self.is_enabled("DIRECTUS_HTTP2")
+
+    @property
+    def use_async_enrichment(self) -> bool:
+        return self.is_enabled("USE_ASYNC_ENRICHMENT")
+
+    @property
+    def use_redis_directus_cache(self) -> bool:
+        return self.is_enabled("USE_REDIS_DIRECTUS_CACHE")
+
+    @property
+    def directus_dict_records(self) -> bool:
+        return self.is_enabled("DIRECTUS_DICT_RECORDS")
+
+    @property
+    def use_directus_snapshot(self) -> bool:
+        return self.is_enabled("USE_DIRECTUS_SNAPSHOT")
+
+    @property
+    def use_staged_pipeline(self) -> bool:
+        return self.is_enabled("USE_STAGED_PIPELINE")
+
+    @property
+    def batch_tasks(self) -> bool:
+        return self.is_enabled("BATCH_TASKS")
+
+    @property
+    def use_event_dedup(self) -> bool:
+        return self.is_enabled("USE_EVENT_DEDUP")
+
+    @property
+    def ignore_task_results(self) -> bool:
+        return self.is_enabled("IGNORE_TASK_RESULTS")
+
+    @property
+    def buffer_sheet_writes(self) -> bool:
+        return self.is_enabled("BUFFER_SHEET_WRITES")
+
+    @property
+    def use_sheet_spool(self) -> bool:
+        return self.is_enabled("USE_SHEET_SPOOL")
+
+    @property
+    def upsert_sheet_rows(self) -> bool:
+        return self.is_enabled("UPSERT_SHEET_ROWS")
+
+    @property
+    def limit_renders(self) -> bool:
+        return self.is_enabled("LIMIT_RENDERS")
+
+    @property
+    def enable_metrics(self) -> bool:
+        return self.is_enabled("ENABLE_METRICS")
+
     @property
     def use_mongo_db(self) -> bool:
         return self.is_enabled("USE_MONGO_DB")
@@ -0,0 +1,60 @@
+import fcntl
+import os
+import threading
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+# POSIX record locks belong to the process, so threads of one process are kept
+# apart by these
+_thread_locks: dict[str, threading.Lock] = {}
+_thread_locks_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # Locks held by threads of the parent would never be released in the child
+    global _thread_locks_lock
+    _thread_locks.clear()
+    _thread_locks_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _thread_lock(path: str) -> threading.Lock:
+    with _thread_locks_lock:
+        return _thread_locks.setdefault(os.path.realpath(path), threading.Lock())
+
+
+@contextmanager
+def locked_file(
+    path: str, mode: str = "a", blocking: bool = True, encoding: Optional[str] = None
+) -> Iterator[Optional[IO]]:
+    """
+    Open ``path`` holding an exclusive lock shared by every thread and
+    process that locks the same file.
+
+    Uses ``lockf`` record locks rather than ``flock``: a child forked while
+    the lock is held does not inherit it, so it cannot keep the lock held
+    after the parent released it.
+
+    :param blocking: Wait for the lock; otherwise yield None if it is taken
+    :return: The open file, or None when not blocking and the lock is taken
+    """
+    thread_lock = _thread_lock(path)
+    if not thread_lock.acquire(blocking):
+        yield None
+        return
+    try:
+        with open(path, mode, encoding=encoding) as f:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.lockf(f, flags, 0, 0, os.SEEK_SET)
+            except (BlockingIOError, PermissionError):
+                yield None
+                return
+            try:
+                yield f
+            finally:
+                fcntl.lockf(f, fcntl.LOCK_UN, 0, 0, os.SEEK_SET)
+    finally:
+        thread_lock.release()
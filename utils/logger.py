@@ -10,7 +10,9 @@ LOGS_PATH = os.getenv("LOGS_PATH", "/var/log/python-service")
 
 
 def setup_logger(name: str):
-    log_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+    log_dir = os.getenv("LOGS_DIR") or os.path.join(
+        os.path.dirname(__file__), "..", "logs"
+    )
     os.makedirs(log_dir, exist_ok=True)
 
     log_file = os.path.join(log_dir, f"{name}.log")
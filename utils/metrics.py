@@ -0,0 +1,180 @@
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from dotenv import load_dotenv
+
+from utils.logger import setup_logger
+
+try:
+    import prometheus_client
+    from prometheus_client import (
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        multiprocess,
+    )
+except ImportError:  # metrics are optional, everything below becomes a no-op
+    prometheus_client = None
+
+load_dotenv()
+
+logger = setup_logger("metrics")
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+# Set for prefork workers so every child's samples reach the one endpoint
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# Seconds; renders and Sheets writes take up to tens of seconds
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LATENCY_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 300, 600)
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+
+def _metric(kind: str, name: str, documentation: str, labels=(), **kwargs):
+    if prometheus_client is None:
+        return _NoopMetric()
+    metric_type = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}[kind]
+    if kind == "gauge" and MULTIPROC_DIR:
+        kwargs.setdefault("multiprocess_mode", "livesum")
+    return metric_type(name, documentation, labels, **kwargs)
+
+
+STAGE_SECONDS = _metric(
+    "histogram",
+    "match_event_stage_seconds",
+    "Time spent in each processing stage",
+    ("stage", "feed_name", "type_id"),
+    buckets=STAGE_BUCKETS,
+)
+EVENTS_TOTAL = _metric(
+    "counter",
+    "match_events_total",
+    "Opta events handled by the worker",
+    ("feed_name", "type_id"),
+)
+EVENT_TO_IMAGE_SECONDS = _metric(
+    "histogram",
+    "match_event_to_image_seconds",
+    "Time from the Opta event timestamp until its image was rendered",
+    ("kind",),
+    buckets=LATENCY_BUCKETS,
+)
+RENDER_QUEUE_DEPTH = _metric(
+    "gauge",
+    "render_queue_depth",
+    "Renders of this worker waiting for a render slot",
+)
+RENDERS_IN_FLIGHT = _metric(
+    "gauge",
+    "renders_in_flight",
+    "Render slots of this worker in use",
+)
+RENDERS_SHED_TOTAL = _metric(
+    "counter",
+    "renders_shed_total",
+    "Image renders dropped by load shedding",
+    ("kind", "reason"),
+)
+DIRECTUS_LOOKUPS_SAVED_TOTAL = _metric(
+    "counter",
+    "directus_lookups_saved_total",
+    "Directus lookups answered without a request: ids cached as unknown "
+    "(negative_hit) or already being fetched by another caller (coalesced)",
+    ("entity", "reason"),
+)
+
+
+@contextmanager
+def timed(stage: str, feed_name: Any = "", type_id: Any = ""):
+    """Observe the duration of the block in ``match_event_stage_seconds``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(
+            stage=stage, feed_name=str(feed_name or ""), type_id=str(type_id or "")
+        ).observe(time.perf_counter() - started)
+
+
+def count_event(feed_name: Any, type_id: Any) -> None:
+    EVENTS_TOTAL.labels(
+        feed_name=str(feed_name or ""), type_id=str(type_id or "")
+    ).inc()
+
+
+def event_age(time_stamp: Optional[str]) -> Optional[float]:
+    """
+    :param time_stamp: Opta ``timeStamp`` of the event, UTC without offset
+        (e.g. "2025-04-23T19:46:58.201")
+    :return: Seconds since the event happened, None if unknown
+    """
+    if not time_stamp:
+        return None
+    try:
+        happened = datetime.fromisoformat(str(time_stamp).replace("Z", ""))
+    except ValueError:
+        return None
+    happened = happened.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - happened).total_seconds()
+
+
+def observe_event_to_image(kind: str, time_stamp: Optional[str]) -> None:
+    latency = event_age(time_stamp)
+    if latency is not None and latency >= 0:
+        EVENT_TO_IMAGE_SECONDS.labels(kind=kind).observe(latency)
+
+
+def registry():
+    """Registry to expose: merges every process' samples in multiprocess mode."""
+    if MULTIPROC_DIR:
+        merged = CollectorRegistry()
+        multiprocess.MultiProcessCollector(merged)
+        return merged
+    return prometheus_client.REGISTRY
+
+
+def start_metrics_server(port: int = METRICS_PORT) -> bool:
+    """
+    Serve /metrics over HTTP in the background.
+
+    :return: False when prometheus_client is not installed
+    """
+    if prometheus_client is None:
+        logger.warning("⚠️ prometheus_client is not installed, metrics are disabled")
+        return False
+    prometheus_client.start_http_server(port, registry=registry())
+    logger.info(f"📈 Serving metrics on :{port}/metrics")
+    return True
+
+
+def metrics_asgi_app():
+    """ASGI app serving the metrics, or None without prometheus_client."""
+    if prometheus_client is None:
+        return None
+    return prometheus_client.make_asgi_app(registry=registry())
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live gauges of a worker child that exited (multiprocess mode)."""
+    if prometheus_client is not None and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
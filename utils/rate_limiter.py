@@ -0,0 +1,162 @@
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import redis
+from dotenv import load_dotenv
+
+from utils.file_lock import locked_file
+from utils.logger import setup_logger
+
+load_dotenv()
+
+logger = setup_logger("rate_limiter")
+
+# Google Sheets allows 60 write requests per minute per user by default
+SHEETS_WRITES_PER_MINUTE = float(os.getenv("SHEETS_WRITES_PER_MINUTE", "60"))
+SHEETS_WRITE_BURST = int(os.getenv("SHEETS_WRITE_BURST", "10"))
+SHEETS_RATE_LIMITER_BACKEND = os.getenv("SHEETS_RATE_LIMITER_BACKEND", "file")
+SHEETS_RATE_LIMITER_REDIS_URL = os.getenv(
+    "SHEETS_RATE_LIMITER_REDIS_URL", "redis://localhost:6379/0"
+)
+SHEETS_RATE_LIMITER_FILE = os.getenv(
+    "SHEETS_RATE_LIMITER_FILE", "/tmp/football_mad_sheets.bucket"  # nosec B108
+)
+
+# Refill and take atomically; TIME keeps every replica on the Redis clock.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+class TokenBucket(ABC):
+    """
+    Token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    Subclasses keep the bucket state somewhere every worker process can see
+    and implement ``try_acquire``.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+
+    @abstractmethod
+    def try_acquire(self, tokens: int = 1) -> float:
+        """
+        Take tokens if available.
+
+        :return: 0 when the tokens were taken, otherwise the seconds to wait
+            before they could be
+        """
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the tokens are taken.
+
+        :param timeout: Give up after this many seconds. Waits forever if omitted
+        :return: True if the tokens were taken, False on timeout
+        :raises ValueError: More tokens than the bucket can ever hold
+        """
+        if tokens > self.capacity:
+            raise ValueError(
+                f"Cannot take {tokens} tokens from a bucket of {self.capacity}"
+            )
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def _refill(self, tokens: float, elapsed: float) -> float:
+        return min(self.capacity, tokens + max(0.0, elapsed) * self.rate)
+
+
+class RedisTokenBucket(TokenBucket):
+    """Bucket shared by all worker replicas through Redis."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        key: str = "rate_limit:sheets",
+        client: Optional[redis.Redis] = None,
+        url: str = SHEETS_RATE_LIMITER_REDIS_URL,
+    ):
+        super().__init__(rate, capacity)
+        self.key = key
+        self.client = client or redis.Redis.from_url(url)
+        self._script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        return float(
+            self._script(keys=[self.key], args=[self.rate, self.capacity, tokens])
+        )
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Bucket kept in a local file guarded by a record lock; shared by every
+    process on the host (or container set) that sees the same file.
+    """
+
+    def __init__(
+        self, rate: float, capacity: int, path: str = SHEETS_RATE_LIMITER_FILE
+    ):
+        super().__init__(rate, capacity)
+        self.path = path
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        with locked_file(self.path, "a+", encoding="utf-8") as f:
+            f.seek(0)
+            try:
+                state = json.loads(f.read() or "{}")
+            except json.JSONDecodeError:
+                state = {}
+            now = time.time()
+            available = self._refill(
+                state.get("tokens", self.capacity), now - state.get("ts", now)
+            )
+            wait = 0.0
+            if available >= tokens:
+                available -= tokens
+            else:
+                wait = (tokens - available) / self.rate
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps({"tokens": available, "ts": now}))
+            f.flush()
+        return wait
+
+
+def sheets_rate_limiter() -> TokenBucket:
+    """Build the Google Sheets write limiter from the SHEETS_* settings."""
+    rate = SHEETS_WRITES_PER_MINUTE / 60
+    if SHEETS_RATE_LIMITER_BACKEND == "redis":
+        return RedisTokenBucket(rate, SHEETS_WRITE_BURST)
+    return FileTokenBucket(rate, SHEETS_WRITE_BURST)
@@ -0,0 +1,40 @@
+import os
+import sqlite3
+from typing import Optional
+
+
+class SQLiteConnection:
+    """
+    Lazily opened SQLite connection of the current process, in WAL mode and
+    autocommit mode (callers run their own ``BEGIN``/``COMMIT``). Connections
+    must not be shared with forked children, so a child opens its own on
+    first use.
+    """
+
+    def __init__(self, path: str, schema: str = "", synchronous: Optional[str] = None):
+        """
+        :param path: Database file; its directory is created if missing
+        :param schema: Script run on every new connection, e.g. CREATE TABLE
+            IF NOT EXISTS statements
+        :param synchronous: ``PRAGMA synchronous`` value, SQLite's default if
+            omitted
+        """
+        self.path = path
+        self.schema = schema
+        self.synchronous = synchronous
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def get(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=10, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            if self.synchronous:
+                conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            if self.schema:
+                conn.executescript(self.schema)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
@@ -6,12 +6,22 @@ import os
 from datetime import datetime, timezone
 
 import websockets.exceptions
+from celery import Celery
 from dotenv import load_dotenv
 
+from celery_worker.batching import MessageBatcher
+from celery_worker.routing import configure_routing
+
 load_dotenv()
 
 
 OUTLET_KEY = os.getenv("OUTLET")
+# Forward live updates to the workers (in per-fixture batches) when set
+BROKER_URL = os.getenv("BROKER_URL")
+
+app = Celery("producer", broker=BROKER_URL)
+configure_routing(app)
+batcher = MessageBatcher(app) if BROKER_URL else None
 
 LOG_FILE = "sddp_messages.json"
 
@@ -32,11 +42,19 @@ def append_to_json_file(msg: dict):
         json.dump(all_messages, f, indent=2)
 
 
+async def flush_batches_periodically():
+    """Send batches of fixtures that went quiet before their window filled up."""
+    while True:
+        await asyncio.sleep(batcher.max_wait)
+        batcher.flush_due()
+
+
 async def connect_sddp(fixture_uuid, feeds=None, include_opta_id=True):
     uri = "wss://sddp-soccer.performgroup.io"
     if feeds is None:
         feeds = ["matchEvent"]
 
+    flusher = asyncio.create_task(flush_batches_periodically()) if batcher else None
     try:
         async with websockets.connect(uri) as websocket:
             print("Connected to SDDP")
@@ -75,6 +93,9 @@ async def connect_sddp(fixture_uuid, feeds=None, include_opta_id=True):
                     print(
                         "Live Update:", json.dumps(msg["content"]["liveData"], indent=2)
                     )
+                    match_details = msg["content"]["liveData"].get("matchDetails")
+                    if batcher and match_details:
+                        batcher.add({"matchDetails": match_details})
 
                 else:
                     print("Received message:", msg)
@@ -83,6 +104,10 @@ async def connect_sddp(fixture_uuid, feeds=None, include_opta_id=True):
         print(f"⚠️ WebSocket closed unexpectedly: {e}")
     except Exception as e:
         print(f"❗ Unexpected error: {e}")
+    finally:
+        if flusher:
+            flusher.cancel()
+            batcher.flush()
 
 
 if __name__ == "__main__":